@@ -14,22 +14,32 @@ Features:
 """
 
 import asyncio
+import hashlib
+import itertools
 import os
 import platform
+import re
+import shutil
 import subprocess
+import threading
+import time
+import uuid
 import json
 import requests
+from collections import OrderedDict, deque, namedtuple
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+from flask.json.provider import JSONProvider
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
+import httpx
+import numpy as np
 import openai
 from semantic_kernel import Kernel
 from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion, OpenAITextEmbedding
-from semantic_kernel.connectors.in_memory import InMemoryCollection
 from semantic_kernel.data.vector import vectorstoremodel, VectorStoreField
 from dataclasses import dataclass, field
 from typing import Annotated
@@ -47,6 +57,109 @@ try:
 except ImportError:
     HAS_PLAYWRIGHT = False
 
+try:
+    from lxml import etree, html as lxml_html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# BeautifulSoup tree builder: libxml2's C parser when available, the pure-Python one otherwise
+_BS4_PARSER = 'lxml' if HAS_LXML else 'html.parser'
+
+try:
+    import faiss
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import uvloop
+    # Every event loop created below (chat requests, kernel calls) runs on uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+# Shared session for outbound page and search fetches: browser-like headers set once, connections pooled
+_http_session = requests.Session()
+_http_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+})
+
+# Opener for files in their associated application, chosen once per platform
+_SYSTEM = platform.system()
+if _SYSTEM == "Windows":
+    _open_in_default_app = os.startfile
+elif _SYSTEM == "Darwin":  # macOS
+    def _open_in_default_app(path):
+        subprocess.run(["open", path])
+else:  # Linux
+    def _open_in_default_app(path):
+        subprocess.run(["xdg-open", path])
+
+# Direct file creation requests, tried in order; case-insensitive so groups keep the user's casing
+_CREATE_FILE_PATTERNS = [
+    # Pattern 1: "write/create/save/make [content] to/as/in/into [filename]"
+    re.compile(r'(?:write|create|save|make)\s+(.+?)\s+(?:to\s+|as\s+|in\s+|into\s+)(?:a\s+)?(?:file\s+)?(?:called\s+|named\s+)?["\']?([^"\s]+\.\w{2,4})["\']?', re.IGNORECASE),
+    # Pattern 2: "create/make [filename] with/containing/that contains [content]"
+    re.compile(r'(?:create|make)\s+(?:a\s+)?(?:file\s+)?(?:called\s+|named\s+)?["\']?([^"\s]+\.\w{2,4})["\']?\s+(?:with|containing|that\s+contains)\s+(.+)', re.IGNORECASE),
+    # Pattern 3: "[filename] with/containing [content]" (simpler format)
+    re.compile(r'["\']?([^"\s]+\.\w{2,4})["\']?\s+(?:with|containing|that\s+contains)\s+(.+)', re.IGNORECASE),
+    # Pattern 4: "write [content] to [filename]" (more specific)
+    re.compile(r'write\s+(.+?)\s+to\s+["\']?([^"\s]+\.\w{2,4})["\']?', re.IGNORECASE),
+]
+
+# Every create-file pattern needs one of these substrings; skips the regexes for plain chat
+_CREATE_FILE_KEYWORDS = ('write', 'create', 'save', 'make', 'with', 'contain')
+
+# Content keywords used to pick an extension for new files, checked in order
+_EXTENSION_HINTS = (
+    ('.py', ('python', 'import', 'def ')),
+    ('.js', ('javascript', 'function', 'console.log')),
+    ('.html', ('html', '<html')),
+    ('.css', ('css', 'style')),
+)
+
+# Delete requests, case-insensitive so the path keeps the user's casing
+_DELETE_PATTERN = re.compile(r'(?:delete|remove)\s+(?:the\s+)?(?:files?\s+)?(?:named\s+)?(.+)', re.IGNORECASE)
+
+# Requests whose answer hinges on exact numbers or file actions; near-duplicates of these are not equivalent
+_SEMANTIC_CACHE_SKIP_PATTERN = re.compile(r'\d|create_file|delete_item')
+
+# "action" key of a JSON action object in a model reply; replies without one are never parsed
+_ACTION_KEY_PATTERN = re.compile(r'"action"\s*:')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_action(text: str) -> Optional[dict]:
+    """Return the first JSON object in a model reply that has both an "action" and a "path".
+
+    The keys may come in any order, so each '{' before an "action" key is tried as the
+    start of the object, nearest first, until one decodes to an action.
+    """
+    for match in _ACTION_KEY_PATTERN.finditer(text):
+        end = match.start()
+        while (start := text.rfind('{', 0, end)) != -1:
+            try:
+                candidate, _ = _JSON_DECODER.raw_decode(text, start)
+            except json.JSONDecodeError:
+                candidate = None
+            if isinstance(candidate, dict) and 'action' in candidate and 'path' in candidate:
+                return candidate
+            end = start
+    return None
+
 
 @vectorstoremodel
 @dataclass
@@ -58,6 +171,230 @@ class MemoryRecord:
     timestamp: Annotated[Optional[str], VectorStoreField('data')] = None
 
 
+# Lightweight result returned from memory retrieval
+MemoryResult = namedtuple("MemoryResult", ["text"])
+
+
+class VectorMemoryIndex:
+    """Cosine-similarity index over memory record embeddings.
+
+    Uses a FAISS inner-product index over L2-normalized vectors when FAISS is
+    installed, otherwise a NumPy matrix product over the same vectors. The exact
+    FAISS index is rebuilt as an HNSW graph once it holds `hnsw_threshold` records
+    so search stays sub-linear as long-running sessions accumulate memory; the
+    rebuild runs in a worker thread while searches keep using the exact index.
+    Vectors are stored as float16, halving the memory of the embedding matrix.
+    """
+
+    def __init__(self, hnsw_threshold: int = 10_000):
+        """Initialize an empty index; the dimension is taken from the first add."""
+        self.records: List[MemoryRecord] = []
+        self.hnsw_threshold = hnsw_threshold
+        self._index = None
+        self._is_hnsw = False
+        self._hnsw_task: Optional[asyncio.Task] = None
+        self._matrix = None  # NumPy fallback buffer; only the first len(records) rows are used
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        """Return a contiguous float32 copy of the vectors scaled to unit length."""
+        vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+        if HAS_FAISS:
+            faiss.normalize_L2(vectors)
+        else:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.maximum(norms, 1e-12)
+        return vectors
+
+    def add(self, records: List[MemoryRecord], embeddings) -> None:
+        """Add records together with their embeddings (one row per record)."""
+        vectors = self._normalize(embeddings)
+        if HAS_FAISS:
+            if self._index is None:
+                self._index = faiss.IndexScalarQuantizer(
+                    vectors.shape[1], faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+                )
+            self._index.add(vectors)
+            if not self._is_hnsw and self._index.ntotal >= self.hnsw_threshold:
+                self._schedule_hnsw_conversion()
+        else:
+            used = len(self.records)
+            needed = used + vectors.shape[0]
+            if self._matrix is None or needed > self._matrix.shape[0]:
+                # Double the capacity so n adds copy O(n) rows in total
+                capacity = 64 if self._matrix is None else self._matrix.shape[0]
+                while capacity < needed:
+                    capacity *= 2
+                grown = np.empty((capacity, vectors.shape[1]), dtype=np.float16)
+                if self._matrix is not None:
+                    grown[:used] = self._matrix[:used]
+                self._matrix = grown
+            self._matrix[used:needed] = vectors
+        self.records.extend(records)
+
+    def _schedule_hnsw_conversion(self) -> None:
+        """Start the HNSW rebuild in the background, or run it inline outside an event loop."""
+        if self._hnsw_task is not None and not self._hnsw_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._index = self._build_hnsw(self._index.reconstruct_n(0, self._index.ntotal))
+            self._is_hnsw = True
+            return
+        self._hnsw_task = loop.create_task(self._convert_to_hnsw())
+
+    async def _convert_to_hnsw(self) -> None:
+        """Rebuild the exact index as an approximate HNSW graph over the same vectors."""
+        try:
+            count = self._index.ntotal
+            hnsw = await asyncio.to_thread(self._build_hnsw, self._index.reconstruct_n(0, count))
+            # Vectors added to the exact index while the graph was being built
+            if self._index.ntotal > count:
+                hnsw.add(self._index.reconstruct_n(count, self._index.ntotal - count))
+            self._index = hnsw
+            self._is_hnsw = True
+        except Exception as e:
+            print(f"HNSW rebuild failed, keeping the exact index: {e}")
+
+    @staticmethod
+    def _build_hnsw(vectors: np.ndarray):
+        """Build an HNSW graph over unit vectors (the slow part of the conversion)."""
+        hnsw = faiss.IndexHNSWSQ(vectors.shape[1], faiss.ScalarQuantizer.QT_fp16, 32, faiss.METRIC_INNER_PRODUCT)
+        hnsw.hnsw.efConstruction = 80
+        hnsw.hnsw.efSearch = 64
+        hnsw.add(vectors)
+        return hnsw
+
+    def search(self, embedding, limit: int = 5) -> List[MemoryRecord]:
+        """Return up to `limit` records most similar to the query embedding."""
+        if not self.records:
+            return []
+
+        limit = min(limit, len(self.records))
+        query = self._normalize(embedding)
+
+        if HAS_FAISS:
+            _, indices = self._index.search(query, limit)
+            return [self.records[i] for i in indices[0] if i >= 0]
+
+        # NumPy has no BLAS path for float16, so score in float32
+        scores = self._matrix[:len(self.records)].astype(np.float32) @ query[0]
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [self.records[i] for i in top]
+
+
+class SemanticResponseCache:
+    """LRU cache of AI responses looked up by query embedding similarity.
+
+    A lookup returns the response of the most similar cached query when the
+    cosine similarity reaches `threshold`, so near-duplicate questions skip the LLM.
+    Entries are tagged with a conversation context and only match lookups made in
+    the same context, so "tell me more" is never answered about another topic.
+    Unit vectors live in one preallocated float32 matrix, one row per entry, so a
+    lookup is a single matrix-vector product and storing never restacks the cache.
+    """
+
+    def __init__(self, max_entries: int = 256, threshold: float = 0.92):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._entries = OrderedDict()  # (context, query text) -> (matrix row, response)
+        self._row_keys: List[Optional[Tuple[bytes, str]]] = [None] * max_entries
+        self._matrix = None  # allocated on the first store, once the dimension is known
+        self._rows_used = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, embedding, context: bytes) -> Optional[str]:
+        """Return the cached response for the closest query stored under the same context.
+
+        Returns None when no entry shares the context or none reaches the threshold.
+        """
+        if not self._entries:
+            return None
+
+        same_context = np.fromiter(
+            (key is not None and key[0] == context for key in self._row_keys[:self._rows_used]),
+            dtype=bool, count=self._rows_used
+        )
+        if not same_context.any():
+            return None
+
+        scores = self._matrix[:self._rows_used] @ VectorMemoryIndex._normalize(embedding)[0]
+        scores[~same_context] = -np.inf
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        key = self._row_keys[best]
+        self._entries.move_to_end(key)
+        return self._entries[key][1]
+
+    def store(self, query: str, embedding, response: str, context: bytes) -> None:
+        """Cache a response under a context, evicting the least recently used entry when full."""
+        vector = VectorMemoryIndex._normalize(embedding)[0]
+        if self._matrix is None:
+            self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+        key = (context, query)
+        if key in self._entries:
+            row = self._entries[key][0]
+        elif self._rows_used < self.max_entries:
+            row = self._rows_used
+            self._rows_used += 1
+        else:
+            # Reuse the row of the least recently used entry
+            _, (row, _) = self._entries.popitem(last=False)
+
+        self._matrix[row] = vector
+        self._row_keys[row] = key
+        self._entries[key] = (row, response)
+        self._entries.move_to_end(key)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+        self._row_keys = [None] * self.max_entries
+        self._rows_used = 0
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire `ttl` seconds after they are stored."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300.0):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expiry, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None when it is missing or expired."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            if cached[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return cached[1]
+
+    def put(self, key, value) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
 class FileManager:
     """File management operations."""
 
@@ -72,6 +409,60 @@ class FileManager:
             self.base_path = current_dir.parent.parent
 
         self.current_path = self.base_path
+        # Resolved once so security checks compare against a canonical path
+        self._resolved_base = self.base_path.resolve()
+        self.max_read_size = 5_000_000  # Largest file read_file will load as text
+
+        # Short-lived cache of resolved paths and their stat results (misses included)
+        self._path_cache = OrderedDict()
+        self._path_cache_lock = threading.Lock()
+        self.path_cache_size = 256
+        self.path_cache_ttl = 1.0  # seconds
+        self.change_count = 0  # bumped on every change made through this manager
+
+    def _is_within_base(self, path: Path) -> bool:
+        """Check that a resolved path is the base directory or inside it."""
+        return path.is_relative_to(self._resolved_base)
+
+    def _lookup_path(self, raw_path: str):
+        """Resolve a path against current_path and stat it, caching the result briefly.
+
+        Returns (path, exists, is_file, size). Missing paths are cached as well so
+        repeated probes from the browser do not hit the filesystem within the TTL.
+        """
+        key = (raw_path, str(self.current_path))
+        now = time.monotonic()
+        with self._path_cache_lock:
+            cached = self._path_cache.get(key)
+            if cached and cached[0] > now:
+                self._path_cache.move_to_end(key)
+                return cached[1]
+
+        # Handle relative vs absolute paths
+        if Path(raw_path).is_absolute():
+            path = Path(raw_path).resolve()
+        else:
+            # Relative path - resolve relative to current_path
+            path = (self.current_path / raw_path).resolve()
+
+        try:
+            st = path.stat()
+            info = (path, True, path.is_file(), st.st_size)
+        except (FileNotFoundError, NotADirectoryError):
+            info = (path, False, False, 0)
+
+        with self._path_cache_lock:
+            self._path_cache[key] = (now + self.path_cache_ttl, info)
+            self._path_cache.move_to_end(key)
+            if len(self._path_cache) > self.path_cache_size:
+                self._path_cache.popitem(last=False)
+        return info
+
+    def _invalidate_path_cache(self):
+        """Drop cached path lookups after the filesystem or current path changes."""
+        with self._path_cache_lock:
+            self._path_cache.clear()
+            self.change_count += 1
 
     def list_directory(self, path: str = None) -> Dict:
         """List directory contents."""
@@ -81,14 +472,13 @@ class FileManager:
 
             # Security check - allow navigation within workspace and drive roots
             target_path_str = str(target_path)
-            base_path_str = str(self.base_path)
 
             # Allow access to:
             # 1. Paths within the base path
             # 2. Drive roots (like C:, D:, etc.)
             # 3. Paths within the GitHub workspace
             allowed = (
-                target_path_str.startswith(base_path_str) or
+                self._is_within_base(target_path) or
                 (len(target_path_str) == 2 and target_path_str.endswith(':')) or  # Drive roots
                 target_path_str.startswith(r'C:\FilesMinis\Code\GitHub')  # Allow workspace navigation
             )
@@ -103,16 +493,21 @@ class FileManager:
                 return {"error": f"Not a directory: {target_path}"}
 
             items = []
-            for item in sorted(target_path.iterdir()):
+            # scandir entries carry file type data from the directory read itself
+            with os.scandir(target_path) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+
+            for entry in entries:
                 try:
-                    stat = item.stat()
+                    stat = entry.stat()
+                    is_file = entry.is_file()
                     items.append({
-                        "name": item.name,
-                        "path": str(item),
-                        "type": "directory" if item.is_dir() else "file",
-                        "size": stat.st_size if item.is_file() else 0,
+                        "name": entry.name,
+                        "path": entry.path,
+                        "type": "directory" if entry.is_dir() else "file",
+                        "size": stat.st_size if is_file else 0,
                         "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        "extension": item.suffix.lower() if item.is_file() else ""
+                        "extension": os.path.splitext(entry.name)[1].lower() if is_file else ""
                     })
                 except (OSError, PermissionError):
                     # Skip items we can't access
@@ -131,27 +526,24 @@ class FileManager:
     def read_file(self, file_path: str) -> Dict:
         """Read file contents."""
         try:
-            # Handle relative vs absolute paths
-            if Path(file_path).is_absolute():
-                path = Path(file_path).resolve()
-            else:
-                # Relative path - resolve relative to current_path
-                path = (self.current_path / file_path).resolve()
+            path, exists, is_file, size = self._lookup_path(file_path)
 
             # Security check
-            if not str(path).startswith(str(self.base_path)):
+            if not self._is_within_base(path):
                 return {"error": "Access denied"}
 
-            if not path.exists():
+            if not exists:
                 return {"error": "File does not exist"}
 
-            if not path.is_file():
+            if not is_file:
                 return {"error": "Not a file"}
 
+            if size > self.max_read_size:
+                return {"error": f"File too large to display ({size} bytes)"}
+
             # Check if it's a text file (simple check)
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = path.read_text(encoding='utf-8', errors='strict')
                 return {"content": content, "encoding": "utf-8"}
             except UnicodeDecodeError:
                 return {"error": "Binary file - cannot display as text"}
@@ -162,15 +554,10 @@ class FileManager:
     def write_file(self, file_path: str, content: str) -> Dict:
         """Write content to file."""
         try:
-            # Handle relative vs absolute paths
-            if Path(file_path).is_absolute():
-                path = Path(file_path).resolve()
-            else:
-                # Relative path - resolve relative to current_path
-                path = (self.current_path / file_path).resolve()
+            path = self._lookup_path(file_path)[0]
 
             # Security check
-            if not str(path).startswith(str(self.base_path)):
+            if not self._is_within_base(path):
                 return {"error": "Access denied"}
 
             # Create directory if it doesn't exist
@@ -178,6 +565,7 @@ class FileManager:
 
             with open(path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            self._invalidate_path_cache()
 
             return {"success": True, "path": str(path)}
 
@@ -195,10 +583,11 @@ class FileManager:
                 path = (self.current_path / dir_path).resolve()
 
             # Security check
-            if not str(path).startswith(str(self.base_path)):
+            if not self._is_within_base(path):
                 return {"error": "Access denied"}
 
             path.mkdir(parents=True, exist_ok=True)
+            self._invalidate_path_cache()
             return {"success": True, "path": str(path)}
 
         except Exception as e:
@@ -207,26 +596,21 @@ class FileManager:
     def delete_item(self, item_path: str) -> Dict:
         """Delete a file or directory."""
         try:
-            # Handle relative vs absolute paths
-            if Path(item_path).is_absolute():
-                path = Path(item_path).resolve()
-            else:
-                # Relative path - resolve relative to current_path
-                path = (self.current_path / item_path).resolve()
+            path, exists, is_file, _ = self._lookup_path(item_path)
 
             # Security check
-            if not str(path).startswith(str(self.base_path)):
+            if not self._is_within_base(path):
                 return {"error": "Access denied"}
 
-            if not path.exists():
+            if not exists:
                 return {"error": "Item does not exist"}
 
-            if path.is_file():
+            if is_file:
                 path.unlink()
             else:
                 # Remove directory and all contents
-                import shutil
                 shutil.rmtree(path)
+            self._invalidate_path_cache()
 
             return {"success": True, "path": str(path)}
 
@@ -236,30 +620,20 @@ class FileManager:
     def open_file(self, file_path: str) -> Dict:
         """Open file in its associated application."""
         try:
-            # Handle relative vs absolute paths
-            if Path(file_path).is_absolute():
-                path = Path(file_path).resolve()
-            else:
-                # Relative path - resolve relative to current_path
-                path = (self.current_path / file_path).resolve()
+            path, exists, is_file, _ = self._lookup_path(file_path)
 
             # Security check
-            if not str(path).startswith(str(self.base_path)):
+            if not self._is_within_base(path):
                 return {"error": "Access denied"}
 
-            if not path.exists():
+            if not exists:
                 return {"error": "File does not exist"}
 
-            if not path.is_file():
+            if not is_file:
                 return {"error": "Not a file"}
 
             # Open file with default application
-            if platform.system() == "Windows":
-                os.startfile(path)
-            elif platform.system() == "Darwin":  # macOS
-                subprocess.run(["open", path])
-            else:  # Linux
-                subprocess.run(["xdg-open", path])
+            _open_in_default_app(path)
 
             return {"success": True, "path": str(path)}
 
@@ -272,7 +646,7 @@ class FileManager:
             target_path = Path(new_path).resolve()
 
             # Security check - don't allow access outside base path
-            if not str(target_path).startswith(str(self.base_path)):
+            if not self._is_within_base(target_path):
                 return {"error": f"Access denied: Cannot navigate outside base directory {self.base_path}"}
 
             if not target_path.exists():
@@ -283,6 +657,7 @@ class FileManager:
 
             # Change current path
             self.current_path = target_path
+            self._invalidate_path_cache()
             return {"success": True, "current_path": str(self.current_path)}
 
         except Exception as e:
@@ -299,23 +674,13 @@ class FileManager:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
 
-            # Set up headers to mimic a real browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-
             # Fetch the webpage
-            response = requests.get(url, headers=headers, timeout=15)
+            response = _http_session.get(url, timeout=15)
             response.raise_for_status()
 
             # Extract content
             if HAS_BEAUTIFULSOUP:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, _BS4_PARSER)
 
                 # Remove script and style elements
                 for script in soup(["script", "style"]):
@@ -343,8 +708,7 @@ class FileManager:
                     main_content = body.get_text(separator='\n', strip=True) if body else text_content
 
                 # Clean up the content
-                lines = [line.strip() for line in main_content.split('\n') if line.strip()]
-                clean_content = '\n'.join(lines[:100])  # Limit to first 100 lines for documents
+                clean_content = _first_nonblank_lines(main_content, 100)  # Limit to first 100 lines for documents
 
                 return {
                     "success": True,
@@ -372,7 +736,6 @@ class FileManager:
             # Generate filename if not provided
             if not filename:
                 # Create a safe filename from URL
-                from urllib.parse import urlparse
                 parsed_url = urlparse(url)
                 domain = parsed_url.netloc.replace('www.', '').replace('.', '_')
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -468,6 +831,7 @@ class FileManager:
 
             with open(doc_path, 'w', encoding='utf-8') as f:
                 f.write(document_content)
+            self._invalidate_path_cache()
 
             return {
                 "success": True,
@@ -484,15 +848,27 @@ class FileManager:
 class AIAssistant:
     """AI assistant for file operations with Semantic Kernel memory."""
 
+    # Mutating file actions: action -> (file manager call, success prefix, failure wording)
+    _FILE_ACTIONS = {
+        'create_file': (lambda fm, path, content: fm.write_file(path, content), "Created file", "create file"),
+        'write_file': (lambda fm, path, content: fm.write_file(path, content), "Wrote to file", "write file"),
+        'create_directory': (lambda fm, path, content: fm.create_directory(path), "Created directory", "create directory"),
+        'delete_item': (lambda fm, path, content: fm.delete_item(path), "Deleted", "delete"),
+    }
+
     def __init__(self, file_manager):
         """Initialize AI assistant with Semantic Kernel memory."""
         self.file_manager = file_manager
         self.kernel = Kernel()
 
-        # Configure Ollama first
+        # Configure Ollama first; chat and embeddings share one keep-alive connection pool
+        self.http_client = openai.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=8, keepalive_expiry=30)
+        )
         ollama_client = openai.AsyncOpenAI(
             base_url="http://localhost:11434/v1",
-            api_key="ollama"
+            api_key="ollama",
+            http_client=self.http_client
         )
 
         self.service = OpenAIChatCompletion(
@@ -501,58 +877,101 @@ class AIAssistant:
             async_client=ollama_client
         )
 
-        # Initialize embeddings service for memory (optional)
+        # Initialize embeddings service for memory (optional); the model is probed on first use,
+        # and embeddings_available only turns True once that probe succeeds
         self.embeddings_available = False
-        embeddings_service = None
+        self._embeddings_checked = False
+        self._embeddings_probe: Optional[asyncio.Task] = None
+        self.embeddings_service = None
         try:
-            embeddings_service = OpenAITextEmbedding(
+            self.embeddings_service = OpenAITextEmbedding(
                 ai_model_id="nomic-embed-text",
                 service_id="ollama-embeddings",
                 async_client=ollama_client
             )
-            # Test the embeddings service
-            try:
-                test_result = asyncio.run(embeddings_service.generate_embeddings(["test"]))
-                # Check if we got a valid result (could be list, array, etc.)
-                if test_result is not None and hasattr(test_result, '__len__') and len(test_result) > 0:
-                    self.embeddings_available = True
-                    print("Embeddings service initialized successfully")
-                else:
-                    print("Embeddings service test failed - no embeddings returned")
-            except Exception as test_error:
-                print(f"Embeddings service test failed: {test_error}")
-                self.embeddings_available = False
         except Exception as e:
             print(f"Embeddings model not available, falling back to conversation history only: {e}")
-            self.memory = None
-
-        # Initialize Semantic Kernel memory if embeddings are available
-        self.collection_name = "ai_researcher_memory"
-        if self.embeddings_available and embeddings_service:
-            self.memory = InMemoryCollection(
-                record_type=MemoryRecord,
-                collection_name=self.collection_name,
-                embedding_generator=embeddings_service
-            )
+            self._embeddings_checked = True
+
+        # Initialize vector memory if an embeddings service exists
+        if self.embeddings_service is not None:
+            self.memory = VectorMemoryIndex()
         else:
-            # Fallback: simple list to store MemoryRecord objects without embeddings
-            self.memory = []
+            # Fallback: bounded deque of MemoryRecord objects without embeddings (last 100 records)
+            self.memory = deque(maxlen=100)
+
+        # Lowercased word sets for the fallback records, kept aligned with self.memory
+        self._memory_tokens = deque(maxlen=100)
+
+        # Records waiting to be embedded; flushed together in one embeddings request
+        self._pending_memories: List[MemoryRecord] = []
+        self.memory_batch_size = 8
+        self.max_pending_memories = 100  # Records kept for retry while embeddings keep failing
+        self._memory_counter = itertools.count()
+        self._flush_task: Optional[asyncio.Task] = None  # background flush of a full batch
+
+        # Formatted list_files results: directory -> ((mtime_ns, file manager change count), text)
+        # Entries also expire after a second, like the file manager's path cache, since files
+        # edited in place outside the manager change neither of those
+        self._listing_cache = TTLCache(max_entries=64, ttl=1.0)
+
+        # Exact repeats (same request and recent history) skip embedding and the LLM entirely
+        self._exact_cache = OrderedDict()
+        self.exact_cache_size = 512
+
+        # Responses to near-duplicate questions are served without calling the LLM
+        self.semantic_cache = SemanticResponseCache()
 
         # Conversation memory - keep track of recent exchanges for context
-        self.conversation_history = []
         self.max_memory_items = 10  # Keep last 10 exchanges for prompt context
+        self.conversation_history = deque(maxlen=self.max_memory_items)
 
         self.kernel.add_service(self.service)
 
         # Register AI functions
         self._register_functions()
 
+    async def _ensure_embeddings(self) -> bool:
+        """Probe the embeddings model once, switching to text-matching memory if it fails.
+
+        Concurrent first callers all wait for the same probe.
+        """
+        if self._embeddings_checked:
+            return self.embeddings_available
+        if self._embeddings_probe is None:
+            self._embeddings_probe = asyncio.get_running_loop().create_task(self._probe_embeddings())
+        # Shielded so a cancelled caller doesn't cancel the probe the others are waiting on
+        await asyncio.shield(self._embeddings_probe)
+        return self.embeddings_available
+
+    async def _probe_embeddings(self):
+        """Embed a test string, then settle on vector or text-matching memory."""
+        try:
+            test_result = await self.embeddings_service.generate_embeddings(["test"])
+            # Check if we got a valid result (could be list, array, etc.)
+            if test_result is not None and hasattr(test_result, '__len__') and len(test_result) > 0:
+                print("Embeddings service initialized successfully")
+                self.embeddings_available = True
+            else:
+                print("Embeddings service test failed - no embeddings returned")
+        except Exception as test_error:
+            print(f"Embeddings service test failed: {test_error}")
+
+        if not self.embeddings_available:
+            # Keep anything queued for embedding in the fallback list instead
+            self.memory = deque(self._pending_memories, maxlen=100)
+            self._memory_tokens = deque(
+                (frozenset(record.text.lower().split()) for record in self.memory), maxlen=100
+            )
+            self._pending_memories = []
+        self._embeddings_checked = True
+
     async def _save_memory(self, user_request: str, ai_response: str):
         """Save conversation exchange to memory (vector store or fallback list)."""
         try:
             # Create a memory record with the conversation exchange
             memory_text = f"User: {user_request}\nAI: {ai_response}"
-            memory_id = f"conv_{len(self.conversation_history)}_{hash(user_request) % 10000}"
+            memory_id = f"conv_{next(self._memory_counter)}_{uuid.uuid4().hex[:8]}"
 
             record = MemoryRecord(
                 id=memory_id,
@@ -561,67 +980,122 @@ class AIAssistant:
                 timestamp=datetime.now().isoformat()
             )
 
-            if self.embeddings_available and isinstance(self.memory, InMemoryCollection):
-                # Use vector store with embeddings
-                await self.memory.upsert([record])
+            if await self._ensure_embeddings() and isinstance(self.memory, VectorMemoryIndex):
+                # Queue for batched embedding; the next search or a full batch flushes it
+                self._pending_memories.append(record)
+                if len(self._pending_memories) >= self.memory_batch_size:
+                    self._schedule_flush()
             else:
-                # Fallback: store in simple list
+                # Fallback: store in bounded deque (oldest records drop off)
                 self.memory.append(record)
-                # Keep only recent records to prevent unbounded growth
-                if len(self.memory) > 100:  # Keep last 100 records
-                    self.memory = self.memory[-100:]
+                self._memory_tokens.append(frozenset(memory_text.lower().split()))
 
         except Exception as e:
             print(f"Failed to save memory: {e}")
 
-    async def _retrieve_relevant_memories(self, query: str, limit: int = 5):
-        """Retrieve relevant memories using vector search or text matching."""
+    def _schedule_flush(self):
+        """Flush a full batch of pending records in the background, off the response path."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_memories_quietly())
+
+    async def _flush_memories_quietly(self):
+        """Background flush that reports failures instead of raising them into the event loop."""
+        try:
+            await self._flush_memories()
+        except Exception as e:
+            print(f"Background memory flush failed, {len(self._pending_memories)} records kept for retry: {e}")
+
+    async def _flush_memories(self, query: Optional[str] = None):
+        """Embed pending records in a single request and add them to the vector index.
+
+        If a query is given it is embedded in the same request and its embedding is returned.
+        If the embeddings request fails, the records go back to the pending list for the next flush.
+        """
+        batch = self._pending_memories
+        self._pending_memories = []
+
+        texts = [record.text for record in batch]
+        if query is not None:
+            texts.append(query)
+        if not texts:
+            return None
+
         try:
-            if self.embeddings_available and isinstance(self.memory, InMemoryCollection):
+            embeddings = await self.embeddings_service.generate_embeddings(texts)
+        except Exception:
+            # Requeue ahead of anything saved meanwhile, keeping only the newest records if
+            # the model stays unreachable
+            self._pending_memories = (batch + self._pending_memories)[-self.max_pending_memories:]
+            raise
+        if batch:
+            self.memory.add(batch, embeddings[:len(batch)])
+        return embeddings[len(batch):] if query is not None else None
+
+    def _history_context(self) -> bytes:
+        """Digest of the last two exchanges; cached answers are only reused under the same recent history."""
+        history_tail = tuple(self.conversation_history)[-2:]
+        return hashlib.blake2b(repr(history_tail).encode('utf-8'), digest_size=16).digest()
+
+    @staticmethod
+    def _exact_cache_key(user_request: str, history_context: bytes) -> bytes:
+        """Hash the request together with the history context it is answered in."""
+        return hashlib.blake2b(user_request.encode('utf-8') + b'\0' + history_context, digest_size=16).digest()
+
+    async def _embed_query(self, query: str):
+        """Embed a user request (flushing pending memories in the same call), or None without embeddings."""
+        try:
+            if await self._ensure_embeddings() and isinstance(self.memory, VectorMemoryIndex):
+                return await self._flush_memories(query)
+        except Exception as e:
+            print(f"Failed to embed request: {e}")
+        return None
+
+    async def _retrieve_relevant_memories(self, query: str, limit: int = 5, query_embedding=None):
+        """Retrieve relevant memories using vector search or text matching.
+
+        A precomputed query embedding from _embed_query avoids embedding the query twice.
+        """
+        try:
+            if await self._ensure_embeddings() and isinstance(self.memory, VectorMemoryIndex):
                 # Use semantic search with embeddings
-                results = await self.memory.search(
-                    values=query,
-                    top=limit
-                )
+                if query_embedding is None:
+                    if not len(self.memory) and not self._pending_memories:
+                        return []
+                    query_embedding = await self._flush_memories(query)
+                results = self.memory.search(query_embedding, limit)
                 # Extract the text from the results
                 memories = []
                 for result in results:
-                    if hasattr(result, 'text'):
-                        memories.append(type('MemoryResult', (), {'text': result.text})())
-                    elif hasattr(result, 'record') and hasattr(result.record, 'text'):
-                        memories.append(type('MemoryResult', (), {'text': result.record.text})())
+                    memories.append(MemoryResult(text=result.text))
                 return memories
             else:
                 # Fallback: simple text matching on stored records
-                if not isinstance(self.memory, list) or not self.memory:
+                if not isinstance(self.memory, deque) or not self.memory:
                     return []
 
-                # Simple relevance scoring based on text overlap
-                query_lower = query.lower()
-                scored_records = []
-
-                for record in self.memory:
-                    if hasattr(record, 'text'):
-                        text_lower = record.text.lower()
-                        # Simple scoring: count matching words
-                        query_words = set(query_lower.split())
-                        text_words = set(text_lower.split())
-                        overlap = len(query_words.intersection(text_words))
-                        score = overlap / len(query_words) if query_words else 0
+                # Simple relevance scoring: fraction of query words found in each record
+                query_words = frozenset(query.lower().split())
+                if not query_words:
+                    return []
 
-                        if score > 0.1:  # Only include if some relevance
-                            scored_records.append((score, record))
+                overlaps = np.fromiter(
+                    (len(query_words & tokens) for tokens in self._memory_tokens),
+                    dtype=np.int32,
+                    count=len(self._memory_tokens)
+                )
+                scores = overlaps / len(query_words)
 
-                # Sort by score and return top matches
-                scored_records.sort(key=lambda x: x[0], reverse=True)
-                top_records = scored_records[:limit]
+                # Only include records with some relevance, best matches first
+                candidates = np.flatnonzero(scores > 0.1)
+                if candidates.size > limit:
+                    candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+                candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
 
                 memories = []
-                for score, record in top_records:
-                    memories.append(type('MemoryResult', (), {'text': record.text})())
+                for i in candidates:
+                    memories.append(MemoryResult(text=self.memory[i].text))
 
                 return memories
-
         except Exception as e:
             print(f"Failed to retrieve memories: {e}")
             return []
@@ -697,33 +1171,13 @@ class AIAssistant:
         """Process user request with conversation memory."""
         try:
             # Check for direct file creation requests and handle them automatically
-            import re
-            # Pattern 1: "write/create/save/make [content] to/as/in/into [filename]"
-            create_file_match = re.search(
-                r'(?:write|create|save|make)\s+(.+?)\s+(?:to\s+|as\s+|in\s+|into\s+)(?:a\s+)?(?:file\s+)?(?:called\s+|named\s+)?["\']?([^"\s]+\.\w{2,4})["\']?',
-                user_request.lower()
-            )
-
-            if not create_file_match:
-                # Pattern 2: "create/make [filename] with/containing/that contains [content]"
-                create_file_match = re.search(
-                    r'(?:create|make)\s+(?:a\s+)?(?:file\s+)?(?:called\s+|named\s+)?["\']?([^"\s]+\.\w{2,4})["\']?\s+(?:with|containing|that\s+contains)\s+(.+)',
-                    user_request.lower()
-                )
-
-            if not create_file_match:
-                # Pattern 3: "[filename] with/containing [content]" (simpler format)
-                create_file_match = re.search(
-                    r'["\']?([^"\s]+\.\w{2,4})["\']?\s+(?:with|containing|that\s+contains)\s+(.+)',
-                    user_request.lower()
-                )
-
-            if not create_file_match:
-                # Pattern 4: "write [content] to [filename]" (more specific)
-                create_file_match = re.search(
-                    r'write\s+(.+?)\s+to\s+["\']?([^"\s]+\.\w{2,4})["\']?',
-                    user_request.lower()
-                )
+            request_lower = user_request.lower()
+            create_file_match = None
+            if any(keyword in request_lower for keyword in _CREATE_FILE_KEYWORDS):
+                for pattern in _CREATE_FILE_PATTERNS:
+                    create_file_match = pattern.search(user_request)
+                    if create_file_match:
+                        break
 
             if create_file_match:
                 groups = create_file_match.groups()
@@ -732,7 +1186,7 @@ class AIAssistant:
                 # Determine which pattern matched and extract content/filename accordingly
                 if len(groups) >= 2:
                     # For patterns where content comes first, then filename
-                    if 'to' in user_request.lower() or 'as' in user_request.lower() or 'into' in user_request.lower():
+                    if 'to' in request_lower or 'as' in request_lower or 'into' in request_lower:
                         content_desc = groups[0].strip()
                         filename = groups[1].strip()
                     else:
@@ -751,16 +1205,12 @@ class AIAssistant:
                 # Ensure filename has proper extension
                 if not '.' in filename:
                     # Try to infer extension from content type
-                    if 'python' in content_desc.lower() or 'import' in content_desc.lower() or 'def ' in content_desc.lower():
-                        filename += '.py'
-                    elif 'javascript' in content_desc.lower() or 'function' in content_desc.lower() or 'console.log' in content_desc.lower():
-                        filename += '.js'
-                    elif 'html' in content_desc.lower() or '<html' in content_desc.lower():
-                        filename += '.html'
-                    elif 'css' in content_desc.lower() or 'style' in content_desc.lower():
-                        filename += '.css'
-                    else:
-                        filename += '.txt'
+                    content_lower = content_desc.lower()
+                    extension = next(
+                        (ext for ext, hints in _EXTENSION_HINTS if any(hint in content_lower for hint in hints)),
+                        '.txt'
+                    )
+                    filename += extension
 
                 # Generate content based on the description
                 try:
@@ -803,7 +1253,7 @@ class AIAssistant:
                 }
 
                 print(f"Creating file: {file_path}")
-                action_result = self._perform_file_action(action_data)
+                action_result = await asyncio.to_thread(self._perform_file_action, action_data)
                 print(f"File creation result: {action_result}")
 
                 if "Created file:" in action_result:
@@ -814,18 +1264,19 @@ class AIAssistant:
                 # Add to conversation history
                 self.conversation_history.append((user_request, response_text))
                 await self._save_memory(user_request, response_text)
-                if len(self.conversation_history) > self.max_memory_items:
-                    self.conversation_history = self.conversation_history[-self.max_memory_items:]
 
                 return response_text
 
             # Check for delete requests - handle multiple files
-            delete_match = re.search(r'(?:delete|remove)\s+(?:the\s+)?(?:files?\s+)?(?:named\s+)?(.+)', user_request.lower())
+            delete_match = None
+            if 'delete' in request_lower or 'remove' in request_lower:
+                delete_match = _DELETE_PATTERN.search(user_request)
             if delete_match:
                 files_to_delete = delete_match.group(1).strip()
 
                 # Handle common patterns
-                if 'test files' in files_to_delete or 'test1.txt and test2.txt' in files_to_delete:
+                files_lower = files_to_delete.lower()
+                if 'test files' in files_lower or 'test1.txt and test2.txt' in files_lower:
                     # Delete both test files
                     results = []
                     for filename in ['test1.txt', 'test2.txt']:
@@ -833,7 +1284,7 @@ class AIAssistant:
                             "action": "delete_item",
                             "path": filename
                         }
-                        result = self._perform_file_action(action_data)
+                        result = await asyncio.to_thread(self._perform_file_action, action_data)
                         results.append(f"{filename}: {result}")
 
                     response_text = f"Action performed: {'; '.join(results)}"
@@ -843,25 +1294,45 @@ class AIAssistant:
                         "action": "delete_item",
                         "path": files_to_delete
                     }
-                    action_result = self._perform_file_action(action_data)
+                    action_result = await asyncio.to_thread(self._perform_file_action, action_data)
                     response_text = f"Action performed: {action_result}"
 
                 # Add to conversation history
                 self.conversation_history.append((user_request, response_text))
                 await self._save_memory(user_request, response_text)
-                if len(self.conversation_history) > self.max_memory_items:
-                    self.conversation_history = self.conversation_history[-self.max_memory_items:]
 
                 return response_text
 
+            # Serve exact repeats, then near-duplicate questions, from cache; both only
+            # under the same recent history the cached answer was given in
+            history_context = self._history_context()
+            exact_key = self._exact_cache_key(user_request, history_context)
+            cached_response = self._exact_cache.get(exact_key)
+            if cached_response is not None:
+                self._exact_cache.move_to_end(exact_key)
+                self.conversation_history.append((user_request, cached_response))
+                await self._save_memory(user_request, cached_response)
+                return cached_response
+
+            # Context is handled by keying hits on the recent history; this only skips
+            # requests whose near-duplicates differ in numbers or actions
+            use_semantic_cache = not _SEMANTIC_CACHE_SKIP_PATTERN.search(user_request)
+            query_embedding = await self._embed_query(user_request)
+            if query_embedding is not None and use_semantic_cache:
+                cached_response = self.semantic_cache.lookup(query_embedding, history_context)
+                if cached_response is not None:
+                    self.conversation_history.append((user_request, cached_response))
+                    await self._save_memory(user_request, cached_response)
+                    return cached_response
+
             # Retrieve relevant memories for context
-            relevant_memories = await self._retrieve_relevant_memories(user_request)
+            relevant_memories = await self._retrieve_relevant_memories(user_request, query_embedding=query_embedding)
 
             # Format conversation history for the prompt (recent exchanges)
             history_text = ""
             if self.conversation_history:
                 history_lines = []
-                for i, (user_msg, ai_response) in enumerate(self.conversation_history[-self.max_memory_items:], 1):
+                for i, (user_msg, ai_response) in enumerate(self.conversation_history, 1):
                     history_lines.append(f"{i}. User: {user_msg}")
                     history_lines.append(f"   AI: {ai_response}")
                 history_text = "\n".join(history_lines)
@@ -892,42 +1363,34 @@ class AIAssistant:
 
             # Try to parse JSON action from response
             action_performed = False
-            try:
-                import json
-                # Look for JSON in the response
-                json_start = response_text.find('{')
-                json_end = response_text.rfind('}') + 1
-                if json_start != -1 and json_end > json_start:
-                    json_str = response_text[json_start:json_end]
-                    action_data = json.loads(json_str)
-
-                    if 'action' in action_data and 'path' in action_data:
-                        # Execute the file action
-                        action_result = self._perform_file_action(action_data)
-                        response_text = f"Action performed: {action_result}"
-                        action_performed = True
-            except json.JSONDecodeError:
-                pass  # Not a JSON action, return normal response
+            # Every file action carries a path, so replies without one are never scanned
+            action_data = _extract_action(response_text) if '"path"' in response_text else None
+            if action_data is not None:
+                # Execute the file action
+                action_result = await asyncio.to_thread(self._perform_file_action, action_data)
+                response_text = f"Action performed: {action_result}"
+                action_performed = True
 
             # If no action was performed and response looks like an error, provide generic fallback
             if not action_performed and ('<' in response_text or 'error' in response_text.lower()):
                 response_text = "I understand your request. Could you please clarify what you'd like me to help you with? I can assist with file operations, web research, or general questions."
+            elif not action_performed:
+                # Only plain answers are cached; file actions must run again every time
+                self._exact_cache[exact_key] = response_text
+                if len(self._exact_cache) > self.exact_cache_size:
+                    self._exact_cache.popitem(last=False)
+                if query_embedding is not None and use_semantic_cache:
+                    self.semantic_cache.store(user_request, query_embedding, response_text, history_context)
 
             # Add to conversation history
             self.conversation_history.append((user_request, response_text))
             await self._save_memory(user_request, response_text)
 
-            # Keep only recent history
-            if len(self.conversation_history) > self.max_memory_items:
-                self.conversation_history = self.conversation_history[-self.max_memory_items:]
-
             return response_text
         except Exception as e:
             error_msg = f"I apologize, but I encountered an error: {e}"
             # Add error to conversation history too
             self.conversation_history.append((user_request, error_msg))
-            if len(self.conversation_history) > self.max_memory_items:
-                self.conversation_history = self.conversation_history[-self.max_memory_items:]
             return error_msg
 
     def _perform_file_action(self, action_data: dict) -> str:
@@ -936,49 +1399,44 @@ class AIAssistant:
         path = action_data.get('path')
         content = action_data.get('content', '')
 
-        if action == 'create_file':
-            result = self.file_manager.write_file(path, content)
+        file_action = self._FILE_ACTIONS.get(action)
+        if file_action is not None:
+            perform, done, failed = file_action
+            result = perform(self.file_manager, path, content)
             if result.get('success'):
-                return f"Created file: {path}"
-            else:
-                return f"Failed to create file: {result.get('error')}"
-
-        elif action == 'write_file':
-            result = self.file_manager.write_file(path, content)
-            if result.get('success'):
-                return f"Wrote to file: {path}"
-            else:
-                return f"Failed to write file: {result.get('error')}"
+                return f"{done}: {path}"
+            return f"Failed to {failed}: {result.get('error')}"
+
+        if action == 'list_files':
+            target = path if path else '.'
+            # Reuse a recent listing while neither the directory nor anything written through
+            # the file manager has changed; in-place edits keep the directory mtime, so listings
+            # only live for the cache's short TTL
+            try:
+                state = (os.stat(target).st_mtime_ns, self.file_manager.change_count)
+            except OSError:
+                state = None
+            cached = self._listing_cache.get(target)
+            if state is not None and cached is not None and cached[0] == state:
+                return cached[1]
 
-        elif action == 'create_directory':
-            result = self.file_manager.create_directory(path)
-            if result.get('success'):
-                return f"Created directory: {path}"
-            else:
-                return f"Failed to create directory: {result.get('error')}"
+            result = self.file_manager.list_directory(target)
+            if 'error' in result:
+                return f"Failed to list files: {result['error']}"
+            file_list = [f"{item['name']} ({item['type']}, {item['size']} bytes)" for item in result.get('items', [])]
+            listing = f"Files in directory: {', '.join(file_list)}"
 
-        elif action == 'delete_item':
-            result = self.file_manager.delete_item(path)
-            if result.get('success'):
-                return f"Deleted: {path}"
-            else:
-                return f"Failed to delete: {result.get('error')}"
-
-        elif action == 'list_files':
-            result = self.file_manager.list_directory(path if path else '.')
-            if 'error' not in result:
-                files = result.get('items', [])
-                file_list = [f"{item['name']} ({item['type']}, {item['size']} bytes)" for item in files]
-                return f"Files in directory: {', '.join(file_list)}"
-            else:
-                return f"Failed to list files: {result.get('error')}"
+            if state is not None:
+                self._listing_cache.put(target, (state, listing))
+            return listing
 
-        else:
-            return f"Unknown action: {action}"
+        return f"Unknown action: {action}"
 
     def clear_memory(self):
         """Clear conversation history and Semantic Kernel memory."""
-        self.conversation_history = []
+        self.conversation_history.clear()
+        self._exact_cache.clear()
+        self.semantic_cache.clear()
         # Note: Semantic Kernel VolatileMemoryStore doesn't have a clear method
         # The memory will be cleared when the application restarts
 
@@ -986,32 +1444,214 @@ class AIAssistant:
         """Get a summary of conversation history and memory status."""
         if not self.conversation_history:
             memory_status = "Memory system: "
-            if self.embeddings_available:
+            if not self._embeddings_checked:
+                memory_status += "Embeddings model not checked yet (checked on the first message)"
+            elif self.embeddings_available:
                 memory_status += "Vector memory with embeddings (semantic search enabled)"
             else:
                 memory_status += "Fallback memory with text matching (no semantic search)"
             return f"No conversation history. {memory_status}"
 
-        summary = f"Recent conversation history ({len(self.conversation_history)} exchanges):\n"
+        def preview(text: str) -> str:
+            return text if len(text) <= 50 else f"{text[:50]}..."
+
+        parts = [f"Recent conversation history ({len(self.conversation_history)} exchanges):\n"]
         for i, (user_msg, ai_response) in enumerate(self.conversation_history, 1):
-            summary += f"{i}. User: {user_msg[:50]}{'...' if len(user_msg) > 50 else ''}\n"
-            summary += f"   AI: {ai_response[:50]}{'...' if len(ai_response) > 50 else ''}\n"
+            parts.append(f"{i}. User: {preview(user_msg)}\n   AI: {preview(ai_response)}\n")
 
-        memory_status = "\nMemory Status: "
-        if self.embeddings_available:
-            memory_status += "Vector memory with embeddings - full semantic search available."
+        parts.append("\nMemory Status: ")
+        if not self._embeddings_checked:
+            parts.append("Embeddings model not checked yet.")
+        elif self.embeddings_available:
+            parts.append("Vector memory with embeddings - full semantic search available.")
         else:
-            memory_status += f"Fallback memory with text matching - {len(self.memory) if isinstance(self.memory, list) else 0} records stored."
+            parts.append(f"Fallback memory with text matching - {len(self.memory) if isinstance(self.memory, deque) else 0} records stored.")
+
+        return ''.join(parts)
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that serializes with orjson.
+
+    NumPy arrays and scalars (similarity scores, embeddings) are encoded natively
+    instead of failing as unknown types.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response from orjson's bytes without a decode/encode round trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), mimetype="application/json"
+        )
+
+
+if HAS_LXML:
+    # DuckDuckGo result titles and snippets, matched by class token in one document walk
+    _DDG_RESULT_XPATH = etree.XPath(
+        "//a[contains(concat(' ', normalize-space(@class), ' '), ' result__a ')"
+        " or contains(concat(' ', normalize-space(@class), ' '), ' result__snippet ')]"
+    )
+
+    # Main content containers in priority order (main, article, .content, #content, .post, .entry),
+    # each taking its first match in the document, as in the BeautifulSoup fallback
+    _MAIN_CONTENT_XPATHS = tuple(etree.XPath(f"({path})[1]") for path in (
+        "//main",
+        "//article",
+        "//*[contains(concat(' ', normalize-space(@class), ' '), ' content ')]",
+        "//*[@id='content']",
+        "//*[contains(concat(' ', normalize-space(@class), ' '), ' post ')]",
+        "//*[contains(concat(' ', normalize-space(@class), ' '), ' entry ')]",
+    ))
+
+
+# Only the start of a fetched page is parsed; the preview keeps its first 50 lines anyway
+MAX_PAGE_BYTES = 64 * 1024
+
+
+def _first_nonblank_lines(text: str, limit: int) -> str:
+    """Join the first `limit` non-blank lines of text, stripped, without splitting the rest."""
+    stripped = (line.strip() for line in text.splitlines())
+    return '\n'.join(itertools.islice(filter(None, stripped), limit))
+
+
+def _read_capped(response, max_bytes: int) -> bytes:
+    """Read a streamed response body until it ends or reaches max_bytes."""
+    buffer = bytearray()
+    for chunk in response.iter_content(chunk_size=16 * 1024):
+        buffer += chunk
+        if len(buffer) >= max_bytes:
+            break
+    return bytes(buffer[:max_bytes])
+
+
+def _parse_html(content: bytes):
+    """Parse an HTML page with lxml, or return None when it has no elements (empty or comment-only)."""
+    if not content.strip():
+        return None
+    try:
+        return lxml_html.fromstring(content)
+    except etree.ParserError:
+        return None
+
+
+def _parse_duckduckgo_results(content: bytes, limit: int = 5) -> List[Dict]:
+    """Extract title, url and snippet of the top results from a DuckDuckGo HTML page."""
+    if HAS_LXML:
+        result_links = []
+        result_snippets = []
+        tree = _parse_html(content)
+        for element in (_DDG_RESULT_XPATH(tree) if tree is not None else ()):
+            if 'result__a' in element.get('class', '').split():
+                result_links.append(element)
+            else:
+                result_snippets.append(element)
+        get_text = lxml_html.HtmlElement.text_content
+    else:
+        soup = BeautifulSoup(content, _BS4_PARSER)
+        result_links = soup.find_all('a', class_='result__a')
+        result_snippets = soup.find_all('a', class_='result__snippet')
+        get_text = lambda element: element.get_text()
+
+    results = []
+    for i, link in enumerate(result_links[:limit]):
+        title = get_text(link).strip()
+        url = link.get('href', '')
+
+        # Get snippet if available
+        snippet = ""
+        if i < len(result_snippets):
+            snippet = get_text(result_snippets[i]).strip()
+
+        if url and title:
+            results.append({
+                'title': title,
+                'url': url,
+                'snippet': snippet[:200] + '...' if len(snippet) > 200 else snippet,
+                'type': 'web'
+            })
+    return results
+
+
+def _extract_page_content(content: bytes) -> Tuple[str, str]:
+    """Return the title and main text of an HTML page, one stripped text run per line."""
+    if HAS_LXML:
+        tree = _parse_html(content)
+        if tree is None:
+            return "No title found", ""
+        etree.strip_elements(tree, 'script', 'style', with_tail=False)
+        title = tree.findtext('.//title') or "No title found"
+
+        get_text = lambda element: '\n'.join(filter(None, (text.strip() for text in element.itertext())))
+        main_content = ""
+        for xpath in _MAIN_CONTENT_XPATHS:
+            matches = xpath(tree)
+            if matches:
+                main_content = get_text(matches[0])
+                break
+        if not main_content:
+            # Fallback to body text
+            body = tree.find('.//body')
+            main_content = get_text(body if body is not None else tree)
+        return title, main_content
 
-        summary += memory_status
-        return summary
+    soup = BeautifulSoup(content, _BS4_PARSER)
+
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+
+    title = soup.title.string if soup.title else "No title found"
+
+    # Try to find main content areas
+    main_content = ""
+    for selector in ('main', 'article', '.content', '#content', '.post', '.entry'):
+        content_elem = soup.select_one(selector)
+        if content_elem:
+            main_content = content_elem.get_text(separator='\n', strip=True)
+            break
+
+    if not main_content:
+        # Fallback to body text
+        body = soup.find('body')
+        main_content = (body or soup).get_text(separator='\n', strip=True)
+    return title, main_content
+
+
+# Recent search results by normalized query, and extracted page content by URL
+_search_cache = TTLCache(max_entries=256, ttl=300)
+_page_cache = TTLCache(max_entries=256, ttl=60)
+
+
+# Single long-lived event loop for async work started from Flask request threads
+_event_loop = asyncio.new_event_loop()
+threading.Thread(target=_event_loop.run_forever, name="asyncio-loop", daemon=True).start()
+
+
+def run_async(coro):
+    """Run a coroutine on the shared background event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop).result()
 
 
 # Initialize Flask app
 app = Flask(__name__)
+if HAS_ORJSON:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for all routes
 app.config['SECRET_KEY'] = 'file-manager-secret-key'
-socketio = SocketIO(app, cors_allowed_origins="*")
+if HAS_ORJSON:
+    # The provider's dumps/loads are stdlib-compatible, so Socket.IO packets use orjson too
+    socketio = SocketIO(app, cors_allowed_origins="*", json=app.json)
+else:
+    socketio = SocketIO(app, cors_allowed_origins="*")
 
 # Initialize components
 file_manager = FileManager()
@@ -1115,16 +1755,11 @@ def chat_api():
     if not message:
         return jsonify({'error': 'Message is required'})
 
-    # Run async AI processing in a new event loop
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
+    # Run async AI processing on the shared event loop
     try:
-        response = loop.run_until_complete(ai_assistant.process_request(message))
-        loop.close()
+        response = run_async(ai_assistant.process_request(message))
         return jsonify({'response': response})
     except Exception as e:
-        loop.close()
         return jsonify({'error': str(e)})
 
 
@@ -1156,48 +1791,23 @@ def web_search():
 
         # Perform real web search using DuckDuckGo
         try:
-            # Use DuckDuckGo search which allows scraping
-            search_url = f"https://duckduckgo.com/html/?q={query.replace(' ', '+')}"
-
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
+            # Repeats of a recent query are answered without another round trip
+            cache_key = ' '.join(query.lower().split())
+            results = _search_cache.get(cache_key)
 
-            response = requests.get(search_url, headers=headers, timeout=10)
-            response.raise_for_status()
+            if results is None:
+                # Use DuckDuckGo search which allows scraping
+                search_url = f"https://duckduckgo.com/html/?q={query.replace(' ', '+')}"
 
-            # Parse search results
-            soup = BeautifulSoup(response.content, 'html.parser')
-            results = []
-
-            # Find search result links
-            result_links = soup.find_all('a', class_='result__a')
-            result_snippets = soup.find_all('a', class_='result__snippet')
-
-            for i, link in enumerate(result_links[:5]):  # Limit to 5 results
-                title = link.get_text().strip()
-                url = link.get('href', '')
-
-                # Get snippet if available
-                snippet = ""
-                if i < len(result_snippets):
-                    snippet = result_snippets[i].get_text().strip()
-
-                if url and title:
-                    results.append({
-                        'title': title,
-                        'url': url,
-                        'snippet': snippet[:200] + '...' if len(snippet) > 200 else snippet,
-                        'type': 'web'
-                    })
+                response = _http_session.get(search_url, timeout=10)
+                response.raise_for_status()
+
+                # Parse search results
+                results = _parse_duckduckgo_results(response.content)
 
-            # If no results from DuckDuckGo, return empty results
-            if not results:
-                results = []
+                # Empty result pages may be transient (rate limiting), so only real hits are cached
+                if results:
+                    _search_cache.put(cache_key, results)
 
             return jsonify({
                 'query': query,
@@ -1239,63 +1849,39 @@ def fetch_webpage_content():
 
         # Use real webpage fetching instead of simulation
         try:
-            # Set up headers to mimic a real browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-
-            # Fetch the webpage
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-
-            # Extract content
-            if HAS_BEAUTIFULSOUP:
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
+            cached_page = _page_cache.get(url)
+            if cached_page is not None:
+                content, status_code = cached_page
+            else:
+                # Fetch the webpage, reading at most the first MAX_PAGE_BYTES of the body
+                response = _http_session.get(url, timeout=10, stream=True)
+                try:
+                    response.raise_for_status()
+                    page_bytes = _read_capped(response, MAX_PAGE_BYTES)
+                finally:
+                    response.close()
 
-                # Get text content
-                text_content = soup.get_text(separator='\n', strip=True)
+                # Extract content
+                if HAS_LXML or HAS_BEAUTIFULSOUP:
+                    title, main_content = _extract_page_content(page_bytes)
 
-                # Extract title
-                title = soup.title.string if soup.title else "No title found"
+                    # Clean up the content
+                    clean_content = _first_nonblank_lines(main_content, 50)  # Limit to first 50 lines
 
-                # Try to find main content areas
-                main_content = ""
-                content_selectors = ['main', 'article', '.content', '#content', '.post', '.entry']
+                    content = f"Title: {title}\n\nMain Content:\n{clean_content}"
 
-                for selector in content_selectors:
-                    content_elem = soup.select_one(selector)
-                    if content_elem:
-                        main_content = content_elem.get_text(separator='\n', strip=True)
-                        break
-
-                if not main_content:
-                    # Fallback to body text
-                    body = soup.find('body')
-                    main_content = body.get_text(separator='\n', strip=True) if body else text_content
-
-                # Clean up the content
-                lines = [line.strip() for line in main_content.split('\n') if line.strip()]
-                clean_content = '\n'.join(lines[:50])  # Limit to first 50 lines
-
-                content = f"Title: {title}\n\nMain Content:\n{clean_content}"
+                else:
+                    # Fallback without BeautifulSoup
+                    page_text = page_bytes.decode(response.encoding or 'utf-8', errors='replace')
+                    content = f"Raw webpage content (BeautifulSoup not available):\n{page_text[:2000]}..."
 
-            else:
-                # Fallback without BeautifulSoup
-                content = f"Raw webpage content (BeautifulSoup not available):\n{response.text[:2000]}..."
+                status_code = response.status_code
+                _page_cache.put(url, (content, status_code))
 
             return jsonify({
                 'url': url,
                 'content': content,
-                'status_code': response.status_code,
+                'status_code': status_code,
                 'timestamp': datetime.now().isoformat(),
                 'source': 'real_webpage'
             })
@@ -1318,7 +1904,7 @@ def fetch_webpage_content():
             3. Key information that would be found"""
 
             try:
-                page_result = asyncio.run(ai_assistant.kernel.invoke(
+                page_result = run_async(ai_assistant.kernel.invoke(
                     function_name="generate_content",
                     plugin_name="content_generator",
                     arguments=KernelArguments(content_request=fetch_prompt)
@@ -1400,7 +1986,6 @@ def test_connection():
 
             # Test OpenAI connection
             try:
-                import openai
                 test_client = openai.AsyncOpenAI(
                     api_key=api_key,
                     base_url=base_url
@@ -1422,11 +2007,10 @@ def test_connection():
 
             # Test Ollama connection
             try:
-                import requests
                 # Test basic connectivity
                 response = requests.get(f"{host_url}/api/tags", timeout=5)
                 if response.status_code == 200:
-                    models = response.json().get('models', [])
+                    models = app.json.loads(response.content).get('models', [])
                     model_names = [m['name'] for m in models]
                     
                     if model in model_names:
@@ -1470,8 +2054,7 @@ def save_settings():
         # Save settings to a configuration file
         settings_file = Path(__file__).parent / 'ai_provider_settings.json'
         
-        with open(settings_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        settings_file.write_text(app.json.dumps(data, indent=2), encoding='utf-8')
 
         print(f"Settings saved: Provider = {provider}")
         
@@ -1492,8 +2075,7 @@ def load_settings():
         settings_file = Path(__file__).parent / 'ai_provider_settings.json'
         
         if settings_file.exists():
-            with open(settings_file, 'r') as f:
-                settings = json.load(f)
+            settings = app.json.loads(settings_file.read_bytes())
             return jsonify({'success': True, 'settings': settings})
         else:
             # Return default settings
@@ -1530,7 +2112,7 @@ def get_ollama_models():
         response = requests.get(f"{host_url}/api/tags", timeout=5)
         
         if response.status_code == 200:
-            models_data = response.json()
+            models_data = app.json.loads(response.content)
             models = models_data.get('models', [])
             
             # Extract model names
@@ -7,6 +7,7 @@ Provides a user-friendly dashboard to interact with MCP tools and AI capabilitie
 
 import asyncio
 import os
+import threading
 from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
 from flask_socketio import SocketIO, emit
 import json
@@ -24,9 +25,21 @@ print("DEBUG: Flask app configured")
 socketio = SocketIO(app, cors_allowed_origins="*")
 print("DEBUG: SocketIO initialized")
 
+# Single long-lived event loop for async work started from Flask request threads
+_event_loop = asyncio.new_event_loop()
+threading.Thread(target=_event_loop.run_forever, name="asyncio-loop", daemon=True).start()
+
+def run_async(coro):
+    """Run a coroutine on the shared background event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop).result()
+
 # Global AI agent instance
 ai_agent = None
 
+# Shared MCP clients, reused by every request and by the AI agent, so each server runs once
+fs_client = MCPFileSystem()
+browser_client = MCPBrowser()
+
 def get_ai_agent():
     """Get or create the AI agent instance."""
     global ai_agent
@@ -34,8 +47,10 @@ def get_ai_agent():
     if ai_agent is None:
         print("DEBUG: Creating new AIAgent instance")
         try:
-            ai_agent = AIAgent()
+            ai_agent = AIAgent(fs_client=fs_client, browser_client=browser_client)
             print("DEBUG: AIAgent created successfully")
+            # Load the model in the background; the first request no longer pays the cold start
+            asyncio.run_coroutine_threadsafe(ai_agent.warmup(), _event_loop)
         except Exception as e:
             print(f"DEBUG: Error creating AIAgent: {e}")
             import traceback
@@ -72,15 +87,9 @@ def browser_automation():
 def test_connection():
     """Test AI agent connection."""
     try:
-        # Create event loop for async operations
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         agent = get_ai_agent()
-        ollama_result = loop.run_until_complete(agent.test_connection())
-        sk_result = loop.run_until_complete(agent.test_semantic_kernel())
-
-        loop.close()
+        ollama_result = run_async(agent.test_connection())
+        sk_result = run_async(agent.test_semantic_kernel())
 
         return jsonify({
             'success': True,
@@ -100,13 +109,8 @@ def analyze_file():
         if not file_path:
             return jsonify({'success': False, 'error': 'File path is required'})
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         agent = get_ai_agent()
-        result = loop.run_until_complete(agent.analyze_file(file_path))
-
-        loop.close()
+        result = run_async(agent.analyze_file(file_path))
 
         # Emit real-time update
         socketio.emit('analysis_complete', {'result': result})
@@ -128,13 +132,8 @@ def generate_code():
         if not description:
             return jsonify({'success': False, 'error': 'Description is required'})
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         agent = get_ai_agent()
-        result = loop.run_until_complete(agent.generate_code(description))
-
-        loop.close()
+        result = run_async(agent.generate_code(description))
 
         # Emit real-time update
         socketio.emit('code_generated', {'result': result})
@@ -153,13 +152,7 @@ def list_directory():
         data = request.get_json()
         path = data.get('path', '.')
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        fs = MCPFileSystem()
-        result = loop.run_until_complete(fs.list_directory(path))
-
-        loop.close()
+        result = run_async(fs_client.list_directory(path))
 
         return jsonify({'success': True, 'files': result})
     except Exception as e:
@@ -175,13 +168,7 @@ def read_file():
         if not file_path:
             return jsonify({'success': False, 'error': 'File path is required'})
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        fs = MCPFileSystem()
-        content = loop.run_until_complete(fs.read_file(file_path))
-
-        loop.close()
+        content = run_async(fs_client.read_file(file_path))
 
         return jsonify({'success': True, 'content': content})
     except Exception as e:
@@ -198,13 +185,7 @@ def write_file():
         if not file_path:
             return jsonify({'success': False, 'error': 'File path is required'})
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        fs = MCPFileSystem()
-        success = loop.run_until_complete(fs.write_file(file_path, content))
-
-        loop.close()
+        success = run_async(fs_client.write_file(file_path, content))
 
         return jsonify({'success': success})
     except Exception as e:
@@ -220,19 +201,13 @@ def navigate():
         if not url:
             return jsonify({'success': False, 'error': 'URL is required'})
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        browser = MCPBrowser()
-        success = loop.run_until_complete(browser.navigate(url))
+        success = run_async(browser_client.navigate(url))
 
         if success:
             # Get page content
-            content = loop.run_until_complete(browser.get_page_content())
+            content = run_async(browser_client.get_page_content())
             socketio.emit('navigation_complete', {'url': url, 'content_length': len(content)})
 
-        loop.close()
-
         return jsonify({'success': success})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -241,13 +216,7 @@ def navigate():
 def get_page_content():
     """Get current page content."""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        browser = MCPBrowser()
-        content = loop.run_until_complete(browser.get_page_content())
-
-        loop.close()
+        content = run_async(browser_client.get_page_content())
 
         return jsonify({'success': True, 'content': content})
     except Exception as e:
@@ -260,13 +229,7 @@ def take_screenshot():
         data = request.get_json()
         filename = data.get('filename', 'screenshot.png')
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        browser = MCPBrowser()
-        success = loop.run_until_complete(browser.take_screenshot(filename))
-
-        loop.close()
+        success = run_async(browser_client.take_screenshot(filename))
 
         return jsonify({'success': success, 'filename': filename})
     except Exception as e:
@@ -282,13 +245,8 @@ def plan_web_task():
         if not task:
             return jsonify({'success': False, 'error': 'Task description is required'})
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         agent = get_ai_agent()
-        plan = loop.run_until_complete(agent.plan_web_task(task))
-
-        loop.close()
+        plan = run_async(agent.plan_web_task(task))
 
         return jsonify({'success': True, 'plan': plan})
     except Exception as e:
@@ -316,14 +274,9 @@ def handle_test_connection():
 def test_connection_background():
     """Background task for testing connection."""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         agent = get_ai_agent()
-        ollama_result = loop.run_until_complete(agent.test_connection())
-        sk_result = loop.run_until_complete(agent.test_semantic_kernel())
-
-        loop.close()
+        ollama_result = run_async(agent.test_connection())
+        sk_result = run_async(agent.test_semantic_kernel())
 
         socketio.emit('connection_test_result', {
             'ollama': ollama_result,
@@ -6,52 +6,63 @@ file and browser operations using MCP tools.
 """
 
 import asyncio
+import hashlib
+import json
 import os
-from typing import Dict, Any, List
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from semantic_kernel import Kernel
 from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
 from semantic_kernel.functions import KernelFunctionFromPrompt, KernelArguments
 import ollama
-import openai
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
 
 # Import our MCP modules
 from mcp_filesystem import MCPFileSystem
 from mcp_browser import MCPBrowser
+from ollama_client import get_ollama_client, warm_up_ollama
 
 
-class AIAgent:
-    """AI Agent powered by Semantic Kernel and Ollama."""
-
-    def __init__(self):
-        """Initialize the AI agent with Semantic Kernel and Ollama."""
-        self.kernel = Kernel()
-
-        # Configure Ollama as the AI service using OpenAI client with custom base URL
-        ollama_client = openai.AsyncOpenAI(
-            base_url="http://localhost:11434/v1",
-            api_key="ollama"  # Dummy key for Ollama
-        )
+# Prompt budget for file content in analyze_file; about 4 bytes of source text per token
+FILE_CONTEXT_TOKENS = 512
+FILE_CONTEXT_BYTES = 4 * FILE_CONTEXT_TOKENS
 
-        self.service = OpenAIChatCompletion(
-            ai_model_id="gemma3:latest",
-            service_id="ollama-gemma3",
-            async_client=ollama_client
-        )
 
-        self.kernel.add_service(self.service)
+@lru_cache(maxsize=1)
+def _token_encoder():
+    """Load the tokenizer used to size prompt context, or None if it is unavailable."""
+    if not HAS_TIKTOKEN:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # the encoding is downloaded on first use
+        print(f"Tokenizer unavailable, using byte limits only: {e}")
+        return None
 
-        # Initialize MCP tools
-        self.fs_client = MCPFileSystem()
-        self.browser_client = MCPBrowser()
 
-        # Register semantic functions
-        self._register_functions()
+def _trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens tokens, on token boundaries."""
+    encoder = _token_encoder()
+    if encoder is None:
+        return text
+    tokens = encoder.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoder.decode(tokens[:max_tokens])
 
-    def _register_functions(self):
-        """Register semantic functions for various tasks."""
 
-        # File analysis function
-        file_analysis_prompt = """
+# File analysis function
+_FILE_ANALYSIS_PROMPT = """
         Analyze the following file content and provide a summary.
         Include key information about the file's purpose, structure, and any important details.
 
@@ -61,14 +72,8 @@ class AIAgent:
         Summary:
         """
 
-        self.file_analysis_func = self.kernel.add_function(
-            plugin_name="file_ops",
-            function_name="analyze_file",
-            prompt=file_analysis_prompt
-        )
-
-        # Code generation function
-        code_gen_prompt = """
+# Code generation function
+_CODE_GEN_PROMPT = """
         Generate Python code based on the following description.
         Make sure the code is well-documented and follows best practices.
 
@@ -77,14 +82,8 @@ class AIAgent:
         Generated Code:
         """
 
-        self.code_gen_func = self.kernel.add_function(
-            plugin_name="code_gen",
-            function_name="generate_code",
-            prompt=code_gen_prompt
-        )
-
-        # Web automation planning function
-        web_automation_prompt = """
+# Web automation planning function
+_WEB_AUTOMATION_PROMPT = """
         Plan a sequence of web automation steps to accomplish the following task.
         Provide step-by-step instructions that can be executed by a browser automation tool.
 
@@ -93,10 +92,143 @@ class AIAgent:
         Steps:
         """
 
-        self.web_automation_func = self.kernel.add_function(
-            plugin_name="web_ops",
-            function_name="plan_web_automation",
-            prompt=web_automation_prompt
+
+@lru_cache(maxsize=1)
+def _prompt_functions() -> Tuple[KernelFunctionFromPrompt, ...]:
+    """Build the agent's prompt functions once per process.
+
+    The functions hold no kernel state, so every AIAgent registers the same
+    objects instead of parsing the templates again.
+    """
+    return (
+        KernelFunctionFromPrompt(function_name="analyze_file", plugin_name="file_ops", prompt=_FILE_ANALYSIS_PROMPT),
+        KernelFunctionFromPrompt(function_name="generate_code", plugin_name="code_gen", prompt=_CODE_GEN_PROMPT),
+        KernelFunctionFromPrompt(
+            function_name="plan_web_automation", plugin_name="web_ops", prompt=_WEB_AUTOMATION_PROMPT
+        ),
+    )
+
+
+class PromptCache:
+    """LRU cache of kernel function results keyed by function and exact arguments."""
+
+    def __init__(self, max_entries: int = 128):
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Number of results kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(plugin_name: str, function_name: str, arguments: Dict[str, Any]) -> bytes:
+        """Hash a function name and its arguments into a cache key."""
+        key_parts = [plugin_name, function_name, arguments]
+        if HAS_ORJSON:
+            data = orjson.dumps(key_parts, option=orjson.OPT_SORT_KEYS)
+        else:
+            data = json.dumps(key_parts, sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Return the cached result for key, or None."""
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: bytes, result: str):
+        """Cache a result, evicting the least recently used entry when full."""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class AIAgent:
+    """AI Agent powered by Semantic Kernel and Ollama."""
+
+    def __init__(self, fs_client: Optional[MCPFileSystem] = None,
+                 browser_client: Optional[MCPBrowser] = None):
+        """Initialize the AI agent with Semantic Kernel and Ollama.
+
+        Args:
+            fs_client: Filesystem MCP client to share with the caller; one is created if omitted
+            browser_client: Browser MCP client to share with the caller; one is created if omitted
+        """
+        self.kernel = Kernel()
+
+        # Configure Ollama as the AI service through the shared OpenAI-compatible client
+        self.service = OpenAIChatCompletion(
+            ai_model_id="gemma3:latest",
+            service_id="ollama-gemma3",
+            async_client=get_ollama_client()
+        )
+
+        self.kernel.add_service(self.service)
+
+        # Initialize MCP tools
+        self.fs_client = fs_client or MCPFileSystem()
+        self.browser_client = browser_client or MCPBrowser()
+
+        # Identical requests are answered from cache instead of calling the model again
+        self.prompt_cache = PromptCache()
+
+        # Native async Ollama client for direct calls, and a cap on concurrent generations
+        # matching the number of requests the Ollama server handles in parallel
+        self._ollama_async = ollama.AsyncClient(host="http://localhost:11434")
+        self._generation_slots = asyncio.Semaphore(int(os.environ.get("OLLAMA_NUM_PARALLEL", "4")))
+
+        # Register semantic functions
+        self._register_functions()
+
+    def _register_functions(self):
+        """Register semantic functions for various tasks."""
+        file_analysis_func, code_gen_func, web_automation_func = _prompt_functions()
+
+        self.file_analysis_func = self.kernel.add_function(plugin_name="file_ops", function=file_analysis_func)
+        self.code_gen_func = self.kernel.add_function(plugin_name="code_gen", function=code_gen_func)
+        self.web_automation_func = self.kernel.add_function(plugin_name="web_ops", function=web_automation_func)
+
+    async def _invoke_cached(self, plugin_name: str, function_name: str, **arguments) -> str:
+        """Invoke a registered kernel function, reusing the result of an identical earlier call.
+
+        Args:
+            plugin_name: Plugin the function is registered under
+            function_name: Name of the function to invoke
+            **arguments: Prompt template arguments
+
+        Returns:
+            Function result as a string
+        """
+        key = PromptCache.make_key(plugin_name, function_name, arguments)
+        cached = self.prompt_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = await self.kernel.invoke(
+            function_name=function_name,
+            plugin_name=plugin_name,
+            arguments=KernelArguments(**arguments)
+        )
+        result_text = str(result)
+        self.prompt_cache.put(key, result_text)
+        return result_text
+
+    @classmethod
+    async def create(cls) -> "AIAgent":
+        """Create an agent whose model and MCP servers are already up."""
+        agent = cls()
+        await agent.warmup()
+        return agent
+
+    async def warmup(self):
+        """Load the model and start both MCP servers concurrently, so the first real request starts hot."""
+        await asyncio.gather(
+            warm_up_ollama(self.service.ai_model_id),
+            self.fs_client.start(),
+            self.browser_client.start()
         )
 
     async def analyze_file(self, file_path: str) -> str:
@@ -109,22 +241,18 @@ class AIAgent:
             AI-generated analysis of the file
         """
         try:
-            # Read file content using MCP
-            content = await self.fs_client.read_file(file_path)
+            # Read only the part of the file that goes into the prompt, then fit it to the token budget
+            content = await self.fs_client.read_file_prefix(file_path, FILE_CONTEXT_BYTES)
+            content = _trim_to_tokens(content, FILE_CONTEXT_TOKENS)
 
             if not content:
                 return f"Could not read file: {file_path}"
 
-            # Use Semantic Kernel for analysis
-            args = KernelArguments(file_path=file_path, file_content=content[:2000])
-            result = await self.kernel.invoke(
-                function_name="analyze_file",
-                plugin_name="file_ops",
-                arguments=args
+            # Use Semantic Kernel for analysis; unchanged content reuses the earlier analysis
+            return await self._invoke_cached(
+                "file_ops", "analyze_file", file_path=file_path, file_content=content
             )
 
-            return str(result)
-
         except Exception as e:
             return f"Error analyzing file: {e}"
 
@@ -138,23 +266,25 @@ class AIAgent:
             Generated code
         """
         try:
-            print(f"DEBUG: Attempting to generate code for description: {description}")
-            args = KernelArguments(description=description)
-            print(f"DEBUG: Created KernelArguments: {args}")
-            print(f"DEBUG: Invoking function 'generate_code' in plugin 'code_gen'")
-            result = await self.kernel.invoke(
-                function_name="generate_code",
-                plugin_name="code_gen",
-                arguments=args
-            )
-            print(f"DEBUG: Invoke result: {result}")
-            return str(result)
+            return await self._invoke_cached("code_gen", "generate_code", description=description)
         except Exception as e:
-            print(f"DEBUG: Exception occurred: {type(e).__name__}: {e}")
-            import traceback
-            print(f"DEBUG: Full traceback: {traceback.format_exc()}")
             return f"Error generating code: {e}"
 
+    async def generate_code_many(self, descriptions: List[str]) -> List[str]:
+        """Generate code for several descriptions concurrently.
+
+        Args:
+            descriptions: Descriptions of the code to generate
+
+        Returns:
+            Generated code, in the same order as the descriptions
+        """
+        async def generate(description: str) -> str:
+            async with self._generation_slots:
+                return await self.generate_code(description)
+
+        return await asyncio.gather(*(generate(d) for d in descriptions))
+
     async def plan_web_task(self, task: str) -> str:
         """Plan web automation steps for a task.
 
@@ -165,13 +295,7 @@ class AIAgent:
             Step-by-step plan for web automation
         """
         try:
-            args = KernelArguments(task=task)
-            result = await self.kernel.invoke(
-                function_name="plan_web_automation",
-                plugin_name="web_ops",
-                arguments=args
-            )
-            return str(result)
+            return await self._invoke_cached("web_ops", "plan_web_automation", task=task)
         except Exception as e:
             return f"Error planning web task: {e}"
 
@@ -205,7 +329,7 @@ class AIAgent:
         """
         try:
             # Test direct Ollama connection
-            response = ollama.chat(
+            response = await self._ollama_async.chat(
                 model='gemma3:latest',
                 messages=[{'role': 'user', 'content': 'Say "Ollama connection successful" in exactly those words.'}]
             )
@@ -236,26 +360,31 @@ class AIAgent:
 async def main():
     """Main function for testing the AI agent."""
     print("Initializing AI Agent...")
-    agent = AIAgent()
+    agent = await AIAgent.create()
+
+    # The five checks are independent, so their model round trips overlap
+    print("\nRunning tests concurrently...")
+    ollama_result, sk_result, analysis_result, code_result, plan_result = await asyncio.gather(
+        agent.test_connection(),
+        agent.test_semantic_kernel(),
+        agent.analyze_file(__file__),
+        agent.generate_code("Create a simple Python function to calculate factorial"),
+        agent.plan_web_task("Check the current weather in New York")
+    )
 
     print("\n1. Testing Ollama connection...")
-    ollama_result = await agent.test_connection()
     print(f"Result: {ollama_result}")
 
     print("\n2. Testing Semantic Kernel...")
-    sk_result = await agent.test_semantic_kernel()
     print(f"Result: {sk_result}")
 
     print("\n3. Testing file analysis...")
-    analysis_result = await agent.analyze_file(__file__)
     print(f"Analysis: {analysis_result[:200]}...")
 
     print("\n4. Testing code generation...")
-    code_result = await agent.generate_code("Create a simple Python function to calculate factorial")
     print(f"Generated code: {code_result[:200]}...")
 
     print("\n5. Testing web automation planning...")
-    plan_result = await agent.plan_web_task("Check the current weather in New York")
     print(f"Plan: {plan_result[:200]}...")
 
     print("\nAI Agent testing complete!")
@@ -6,76 +6,24 @@ It connects to an MCP browser server (Playwright) to perform web automation task
 """
 
 import asyncio
-import subprocess
-import json
 from typing import List, Dict, Any, Optional
 
+from mcp_client import MCPClient
 
-class MCPBrowser:
+
+class MCPBrowser(MCPClient):
     """MCP Browser client for web automation."""
 
-    def __init__(self, server_command: str = "npx", server_args: Optional[List[str]] = None):
+    def __init__(self, server_command: str = "npx", server_args: Optional[List[str]] = None,
+                 server_url: Optional[str] = None):
         """Initialize MCP Browser client.
 
         Args:
             server_command: Command to start the MCP browser server (usually 'npx')
             server_args: Arguments for the server command (usually ['@playwright/mcp@latest'])
+            server_url: Streamable HTTP endpoint of a running server; skips starting a process
         """
-        self.server_command = server_command
-        self.server_args = server_args or ["@playwright/mcp@latest"]
-
-    async def _call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
-        """Call an MCP tool with the given arguments.
-
-        Args:
-            tool_name: Name of the tool to call
-            arguments: Arguments for the tool
-
-        Returns:
-            Tool execution result
-        """
-        try:
-            # Start the MCP server process
-            process = await asyncio.create_subprocess_exec(
-                self.server_command, *self.server_args,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-
-            # Prepare the MCP request
-            request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments
-                }
-            }
-
-            # Send request
-            request_json = json.dumps(request).encode('utf-8')
-            process.stdin.write(request_json)
-            await process.stdin.drain()
-            process.stdin.close()
-
-            # Read response
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                error_msg = stderr.decode('utf-8') if stderr else "Unknown error"
-                raise Exception(f"MCP server error: {error_msg}")
-
-            response = json.loads(stdout.decode('utf-8'))
-            if 'error' in response:
-                raise Exception(f"MCP error: {response['error']}")
-
-            return response.get('result')
-
-        except Exception as e:
-            print(f"Error calling MCP tool {tool_name}: {e}")
-            return None
+        super().__init__(server_command, server_args or ["@playwright/mcp@latest"], server_url)
 
     async def navigate(self, url: str) -> bool:
         """Navigate to a URL.
@@ -193,36 +141,47 @@ class MCPBrowser:
             return ""
 
 
+# Client shared by the convenience functions, so they reuse one server process
+_browser: Optional[MCPBrowser] = None
+_browser_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_browser() -> MCPBrowser:
+    """Return the shared client, replacing it when called from a different event loop."""
+    global _browser, _browser_loop
+    loop = asyncio.get_running_loop()
+    if _browser is None or _browser_loop is not loop:
+        if _browser is not None:
+            # Stop the previous loop's server instead of leaking its process
+            _browser.close_from_other_loop(_browser_loop)
+        _browser, _browser_loop = MCPBrowser(), loop
+    return _browser
+
+
 # Convenience functions for easy use
 async def navigate(url: str) -> bool:
     """Navigate to URL."""
-    browser = MCPBrowser()
-    return await browser.navigate(url)
+    return await _get_browser().navigate(url)
 
 async def click(selector: str) -> bool:
     """Click element."""
-    browser = MCPBrowser()
-    return await browser.click_element(selector)
+    return await _get_browser().click_element(selector)
 
 async def type_text(selector: str, text: str) -> bool:
     """Type text into element."""
-    browser = MCPBrowser()
-    return await browser.type_text(selector, text)
+    return await _get_browser().type_text(selector, text)
 
 async def get_content() -> str:
     """Get page content."""
-    browser = MCPBrowser()
-    return await browser.get_page_content()
+    return await _get_browser().get_page_content()
 
 async def screenshot(filename: str = "screenshot.png") -> bool:
     """Take screenshot."""
-    browser = MCPBrowser()
-    return await browser.take_screenshot(filename)
+    return await _get_browser().take_screenshot(filename)
 
 async def wait_for(selector: str, timeout: int = 10000) -> bool:
     """Wait for element."""
-    browser = MCPBrowser()
-    return await browser.wait_for_element(selector, timeout)
+    return await _get_browser().wait_for_element(selector, timeout)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,348 @@
+"""
+MCP Client Module
+
+This module provides the transports shared by the MCP clients. Over stdio,
+one server process is started per client and kept running, and JSON-RPC
+requests are multiplexed over its stdin/stdout by request id. Over HTTP,
+requests are posted to a running server through one pooled connection.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import signal
+from collections import deque
+from typing import List, Dict, Any, Optional
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# JSON-RPC frame codec (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+_json_dumps = orjson.dumps if HAS_ORJSON else (lambda obj: json.dumps(obj).encode('utf-8'))
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+# Longest newline-delimited frame the stdout reader accepts (asyncio's default is 64 KiB,
+# less than a single read_file or page content reply can be)
+_MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+# Fixed part of every request frame; only the id, method and params are filled in per call
+_REQUEST_FRAME = b'{"jsonrpc":"2.0","id":%d,"method":"%b","params":%b}\n'
+
+
+class MCPClient:
+    """Base MCP client that keeps one server connection alive across tool calls."""
+
+    def __init__(self, server_command: str, server_args: Optional[List[str]] = None,
+                 server_url: Optional[str] = None):
+        """Initialize MCP client.
+
+        Args:
+            server_command: Command to start the MCP server
+            server_args: Arguments for the server command
+            server_url: Streamable HTTP endpoint of an already running server
+                (e.g. 'http://localhost:8931/mcp'); when set, no process is started
+        """
+        self.server_command = server_command
+        self.server_args = server_args or []
+        self.server_url = server_url
+        self._http = None  # httpx.AsyncClient, created on first use
+        self._http_session_id: Optional[str] = None
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._stderr_tail = deque(maxlen=20)  # last stderr lines, for error messages
+
+        # Upper bound on tool calls in flight at once, so gathered calls queue here
+        # instead of piling up pipe buffers, sockets and server-side work
+        self.max_concurrency = int(os.environ.get("MCP_MAX_CONCURRENCY", "8"))
+        self._call_slots: Optional[asyncio.Semaphore] = None
+
+        # Seconds to wait for any single response before giving up on it
+        self.request_timeout = float(os.environ.get("MCP_REQUEST_TIMEOUT", "60"))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _connect(self):
+        """Make sure the server connection is up and initialized, for either transport."""
+        if self.server_url:
+            await self._ensure_http_session()
+        else:
+            await self._ensure_process()
+
+    async def _ensure_http_session(self):
+        """Open the pooled HTTP client and complete the MCP handshake, unless already done."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+
+        async with self._start_lock:
+            if self._http is not None:
+                return
+            if not HAS_HTTPX:
+                raise Exception("httpx is required for the HTTP transport")
+
+            self._http = httpx.AsyncClient(
+                headers={"Accept": "application/json, text/event-stream"},
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=16, keepalive_expiry=60),
+                timeout=httpx.Timeout(self.request_timeout, connect=10.0)
+            )
+            try:
+                await self._request("initialize", self._initialize_params())
+                await self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            except Exception:
+                await self._http.aclose()
+                self._http = None
+                self._http_session_id = None
+                raise
+
+    def _initialize_params(self) -> Dict[str, Any]:
+        """Parameters of the MCP initialize request."""
+        return {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": type(self).__name__, "version": "1.0"}
+        }
+
+    async def _post(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Post one JSON-RPC message and return the response frame with the same id, if any."""
+        headers = {"Content-Type": "application/json"}
+        if self._http_session_id:
+            headers["Mcp-Session-Id"] = self._http_session_id
+        response = await self._http.post(self.server_url, content=_json_dumps(message), headers=headers)
+        response.raise_for_status()
+        self._http_session_id = response.headers.get("mcp-session-id", self._http_session_id)
+
+        if 'id' not in message or not response.content:
+            return None
+        if response.headers.get("content-type", "").startswith("text/event-stream"):
+            # Streamed reply: find the event carrying the response to this request
+            for line in response.text.splitlines():
+                if line.startswith("data:"):
+                    frame = _json_loads(line[5:])
+                    if isinstance(frame, dict) and frame.get('id') == message['id']:
+                        return frame
+            raise Exception("MCP server error: no response in event stream")
+        return _json_loads(response.content)
+
+    async def _ensure_process(self) -> asyncio.subprocess.Process:
+        """Start the server and complete the MCP handshake, unless it is already running."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+
+        async with self._start_lock:
+            if self._process is not None and self._process.returncode is None:
+                if not self._reader_task.done():
+                    return self._process
+                # The reader gave up on a still running server; replace the server
+                await self._kill_process(self._process)
+
+            self._process = await asyncio.create_subprocess_exec(
+                self.server_command, *self.server_args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=_MAX_FRAME_BYTES
+            )
+            self._stderr_tail.clear()
+            self._reader_task = asyncio.create_task(self._read_responses(self._process))
+            self._stderr_task = asyncio.create_task(self._read_stderr(self._process))
+
+            try:
+                await self._request("initialize", self._initialize_params())
+                await self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            except Exception:
+                # Don't leave a half-initialized server for the next call to reuse
+                await self._kill_process(self._process)
+                raise
+            return self._process
+
+    @staticmethod
+    async def _kill_process(process: asyncio.subprocess.Process):
+        """Kill a server process, unless it already exited, and reap it."""
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+
+    async def _read_responses(self, process: asyncio.subprocess.Process):
+        """Route newline-delimited JSON-RPC responses to the futures waiting on their ids."""
+        reason = "server process exited"
+        try:
+            async for line in process.stdout:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = _json_loads(line)
+                except json.JSONDecodeError:
+                    continue  # Log output on stdout, not a protocol frame
+
+                future = self._pending.pop(message.get('id'), None) if isinstance(message, dict) else None
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except ValueError:
+            # The stream reader refuses a line longer than its limit and can't resync after it
+            reason = f"frame larger than {_MAX_FRAME_BYTES} bytes"
+        except Exception as e:
+            reason = f"{type(e).__name__}: {e}"
+        finally:
+            if process.returncode is None and reason != "server process exited":
+                # Nothing reads the server's replies any more; stop it so the next call restarts it
+                process.kill()
+            # Fail whatever is still waiting on this reader
+            error_msg = f"MCP reader stopped: {reason}"
+            if self._stderr_tail:
+                error_msg += "\n" + "\n".join(self._stderr_tail)
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(Exception(error_msg))
+            self._pending.clear()
+
+    async def _read_stderr(self, process: asyncio.subprocess.Process):
+        """Drain stderr so the server never blocks on a full pipe, keeping the last lines."""
+        async for line in process.stderr:
+            self._stderr_tail.append(line.decode('utf-8', errors='replace').rstrip())
+
+    async def _send(self, message: Dict[str, Any]):
+        """Send one JSON-RPC message that expects no response."""
+        if self.server_url:
+            await self._post(message)
+        else:
+            await self._write(_json_dumps(message) + b"\n")
+
+    async def _write(self, frame: bytes):
+        """Write one encoded frame to the server's stdin."""
+        self._process.stdin.write(frame)
+        await self._process.stdin.drain()
+
+    async def _request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a JSON-RPC request and wait for the response with the same id."""
+        request_id = next(self._request_ids)
+        if self.server_url:
+            return await self._post({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params
+            })
+
+        if self._reader_task is None or self._reader_task.done():
+            raise Exception("MCP reader stopped: no server connection")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._write(_REQUEST_FRAME % (request_id, method.encode('ascii'), _json_dumps(params)))
+            return await asyncio.wait_for(future, self.request_timeout)
+        except asyncio.TimeoutError:
+            raise Exception(f"MCP server error: no response to {method} within {self.request_timeout:g}s")
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Call an MCP tool with the given arguments.
+
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Arguments for the tool
+
+        Returns:
+            Tool execution result
+        """
+        if self._call_slots is None:
+            self._call_slots = asyncio.Semaphore(self.max_concurrency)
+
+        try:
+            async with self._call_slots:
+                await self._connect()
+                response = await self._request("tools/call", {
+                    "name": tool_name,
+                    "arguments": arguments
+                })
+
+            if 'error' in response:
+                raise Exception(f"MCP error: {response['error']}")
+
+            return response.get('result')
+
+        except Exception as e:
+            print(f"Error calling MCP tool {tool_name}: {e}")
+            return None
+
+    async def start(self) -> bool:
+        """Connect to the server ahead of the first tool call.
+
+        Returns:
+            True if the server is up and initialized, False otherwise
+        """
+        try:
+            await self._connect()
+            return True
+        except Exception as e:
+            print(f"Error starting MCP server {self.server_url or self.server_command}: {e}")
+            return False
+
+    def close_from_other_loop(self, loop: asyncio.AbstractEventLoop):
+        """Close a client that belongs to another event loop, without waiting for it.
+
+        If that loop still runs, aclose() is scheduled on it; otherwise the loop can no
+        longer drive a clean shutdown, so the server process is killed directly.
+        """
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop)
+            return
+
+        process = self._process
+        if process is None:
+            return
+        if process.returncode is None:
+            try:
+                # Signal the pid directly; the process transport needs its (closed) loop
+                os.kill(process.pid, signal.SIGKILL if hasattr(signal, 'SIGKILL') else signal.SIGTERM)
+            except OSError:
+                pass  # Already gone
+        try:
+            # Mark the transport closed, so its __del__ doesn't try again on the closed loop
+            process._transport.close()
+        except RuntimeError:
+            pass
+
+    async def aclose(self):
+        """Close the HTTP client, or stop the server process and its reader tasks."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._http_session_id = None
+
+        process, self._process = self._process, None
+        if process is None:
+            return
+
+        if process.returncode is None:
+            process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+
+        for task in (self._reader_task, self._stderr_task):
+            if task is not None:
+                await asyncio.gather(task, return_exceptions=True)
+        self._reader_task = self._stderr_task = None
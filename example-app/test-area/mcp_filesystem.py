@@ -6,76 +6,24 @@ It connects to an MCP filesystem server to perform file operations.
 """
 
 import asyncio
-import subprocess
-import json
 from typing import List, Dict, Any, Optional
 
+from mcp_client import MCPClient
 
-class MCPFileSystem:
+
+class MCPFileSystem(MCPClient):
     """MCP FileSystem client for file operations."""
 
-    def __init__(self, server_command: str = "filesystem-operations-mcp", server_args: Optional[List[str]] = None):
+    def __init__(self, server_command: str = "filesystem-operations-mcp", server_args: Optional[List[str]] = None,
+                 server_url: Optional[str] = None):
         """Initialize MCP FileSystem client.
 
         Args:
             server_command: Command to start the MCP filesystem server
             server_args: Arguments for the server command
+            server_url: Streamable HTTP endpoint of a running server; skips starting a process
         """
-        self.server_command = server_command
-        self.server_args = server_args or []
-
-    async def _call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
-        """Call an MCP tool with the given arguments.
-
-        Args:
-            tool_name: Name of the tool to call
-            arguments: Arguments for the tool
-
-        Returns:
-            Tool execution result
-        """
-        try:
-            # Start the MCP server process
-            process = await asyncio.create_subprocess_exec(
-                self.server_command, *self.server_args,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-
-            # Prepare the MCP request
-            request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments
-                }
-            }
-
-            # Send request
-            request_json = json.dumps(request).encode('utf-8')
-            process.stdin.write(request_json)
-            await process.stdin.drain()
-            process.stdin.close()
-
-            # Read response
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                error_msg = stderr.decode('utf-8') if stderr else "Unknown error"
-                raise Exception(f"MCP server error: {error_msg}")
-
-            response = json.loads(stdout.decode('utf-8'))
-            if 'error' in response:
-                raise Exception(f"MCP error: {response['error']}")
-
-            return response.get('result')
-
-        except Exception as e:
-            print(f"Error calling MCP tool {tool_name}: {e}")
-            return None
+        super().__init__(server_command, server_args or [], server_url)
 
     async def list_directory(self, path: str) -> List[Dict[str, Any]]:
         """List contents of a directory.
@@ -113,6 +61,29 @@ class MCPFileSystem:
             print(f"Error reading file {path}: {e}")
             return ""
 
+    async def read_file_prefix(self, path: str, max_bytes: int = 2048) -> str:
+        """Read at most the first max_bytes of a file.
+
+        The limit is passed to the server; servers that ignore it still have their
+        reply truncated, and if the tool call fails the file is read locally.
+
+        Args:
+            path: File path to read
+            max_bytes: Maximum number of bytes to read
+
+        Returns:
+            Start of the file contents as string
+        """
+        try:
+            result = await self._call_tool("read_file", {"path": path, "max_bytes": max_bytes})
+            if result and 'content' in result:
+                text = _content_text(result['content'])
+                return text.encode('utf-8')[:max_bytes].decode('utf-8', errors='ignore')
+            return await asyncio.to_thread(_read_local_prefix, path, max_bytes)
+        except Exception as e:
+            print(f"Error reading file {path}: {e}")
+            return ""
+
     async def write_file(self, path: str, content: str) -> bool:
         """Write content to a file.
 
@@ -147,26 +118,54 @@ class MCPFileSystem:
             return False
 
 
+def _content_text(content: Any) -> str:
+    """Join the text of an MCP tool result's content, which is a string or a list of content parts."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return ''.join(part.get('text', '') for part in content if isinstance(part, dict))
+    return str(content)
+
+
+def _read_local_prefix(path: str, max_bytes: int) -> str:
+    """Read the first max_bytes of a local file, dropping a trailing partial character."""
+    with open(path, 'rb') as f:
+        return f.read(max_bytes).decode('utf-8', errors='ignore')
+
+
+# Client shared by the convenience functions, so they reuse one server process
+_filesystem: Optional[MCPFileSystem] = None
+_filesystem_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_filesystem() -> MCPFileSystem:
+    """Return the shared client, replacing it when called from a different event loop."""
+    global _filesystem, _filesystem_loop
+    loop = asyncio.get_running_loop()
+    if _filesystem is None or _filesystem_loop is not loop:
+        if _filesystem is not None:
+            # Stop the previous loop's server instead of leaking its process
+            _filesystem.close_from_other_loop(_filesystem_loop)
+        _filesystem, _filesystem_loop = MCPFileSystem(), loop
+    return _filesystem
+
+
 # Convenience functions for easy use
 async def list_dir(path: str) -> List[Dict[str, Any]]:
     """List directory contents."""
-    fs = MCPFileSystem()
-    return await fs.list_directory(path)
+    return await _get_filesystem().list_directory(path)
 
 async def read_file(path: str) -> str:
     """Read file contents."""
-    fs = MCPFileSystem()
-    return await fs.read_file(path)
+    return await _get_filesystem().read_file(path)
 
 async def write_file(path: str, content: str) -> bool:
     """Write content to file."""
-    fs = MCPFileSystem()
-    return await fs.write_file(path, content)
+    return await _get_filesystem().write_file(path, content)
 
 async def create_dir(path: str) -> bool:
     """Create directory."""
-    fs = MCPFileSystem()
-    return await fs.create_directory(path)
+    return await _get_filesystem().create_directory(path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+"""
+Ollama Client Module
+
+This module provides the OpenAI-compatible Ollama client shared by the AI agent
+and the story generator, so every kernel in the process reuses one connection pool.
+"""
+
+from functools import lru_cache
+
+import httpx
+import openai
+
+OLLAMA_BASE_URL = "http://localhost:11434/v1"
+
+
+@lru_cache(maxsize=1)
+def get_ollama_client() -> openai.AsyncOpenAI:
+    """Return the process-wide AsyncOpenAI client for the local Ollama server.
+
+    The client's keep-alive connections belong to the event loop that opened them,
+    so it is meant for processes that run their async work on a single loop.
+    """
+    http_client = openai.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=32, keepalive_expiry=60)
+    )
+    return openai.AsyncOpenAI(
+        base_url=OLLAMA_BASE_URL,
+        api_key="ollama",  # Dummy key for Ollama
+        http_client=http_client
+    )
+
+
+async def warm_up_ollama(model: str = "gemma3:latest"):
+    """Open a pooled connection and load the model with a one-token completion.
+
+    Args:
+        model: Ollama model to load into memory
+    """
+    try:
+        await get_ollama_client().chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": "hi"}],
+            max_tokens=1
+        )
+    except Exception as e:
+        print(f"Ollama warm-up failed: {e}")
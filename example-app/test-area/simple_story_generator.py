@@ -8,10 +8,12 @@ a sci-fi story and save it to a file.
 
 import asyncio
 import os
+from pathlib import Path
 from semantic_kernel import Kernel
 from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
 from semantic_kernel.functions import KernelArguments
-import openai
+
+from ollama_client import get_ollama_client, warm_up_ollama
 
 
 class SimpleStoryGenerator:
@@ -21,16 +23,11 @@ class SimpleStoryGenerator:
         """Initialize the story generator."""
         self.kernel = Kernel()
 
-        # Configure Ollama as the AI service using OpenAI client with custom base URL
-        ollama_client = openai.AsyncOpenAI(
-            base_url="http://localhost:11434/v1",
-            api_key="ollama"  # Dummy key for Ollama
-        )
-
+        # Configure Ollama as the AI service through the shared OpenAI-compatible client
         self.service = OpenAIChatCompletion(
             ai_model_id="gemma3:latest",
             service_id="ollama-gemma3",
-            async_client=ollama_client
+            async_client=get_ollama_client()
         )
 
         self.kernel.add_service(self.service)
@@ -53,6 +50,10 @@ class SimpleStoryGenerator:
             """
         )
 
+    async def warmup(self):
+        """Connect to Ollama and load the model before the story is requested."""
+        await warm_up_ollama(self.service.ai_model_id)
+
     async def generate_story(self) -> str:
         """Generate a sci-fi story."""
         try:
@@ -65,11 +66,10 @@ class SimpleStoryGenerator:
         except Exception as e:
             return f"Error generating story: {e}"
 
-    def save_to_file(self, content: str, filename: str) -> bool:
-        """Save content to a file."""
+    async def save_to_file(self, content: str, filename: str) -> bool:
+        """Save content to a file without blocking the event loop."""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
+            await asyncio.to_thread(Path(filename).write_text, content, encoding='utf-8')
             print(f"Story saved to {filename}")
             return True
         except Exception as e:
@@ -83,6 +83,7 @@ async def main():
 
     # Create the generator
     generator = SimpleStoryGenerator()
+    await generator.warmup()
 
     print("Generating sci-fi story...")
 
@@ -102,7 +103,7 @@ async def main():
 
     # Save to file
     filename = "sci-fi-01.md"
-    success = generator.save_to_file(story, filename)
+    success = await generator.save_to_file(story, filename)
 
     if success:
         print(f"\nStory saved to {filename}")
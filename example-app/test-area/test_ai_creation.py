@@ -6,21 +6,18 @@ Test script for AI file creation functionality
 import asyncio
 import sys
 import os
+from pathlib import Path
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from file_manager_app import AIAssistant, FileManager
 
-async def test_ai_file_creation():
+async def test_ai_file_creation(ai_assistant):
     """Test the AI file creation functionality."""
     print("Testing AI file creation...")
     print("=" * 50)
 
-    # Initialize components
-    file_manager = FileManager()
-    ai_assistant = AIAssistant(file_manager)
-
     # Test request
     test_request = "write a short sci-fi poem to a file named sci-fi-poem.txt"
 
@@ -35,18 +32,17 @@ async def test_ai_file_creation():
         # Check if file was created
         if os.path.exists("sci-fi-poem.txt"):
             print("✅ File 'sci-fi-poem.txt' was created successfully!")
+            # Read off the event loop, as the assistant's own file operations are
+            raw_content = await asyncio.to_thread(Path("sci-fi-poem.txt").read_bytes)
             try:
-                with open("sci-fi-poem.txt", "r", encoding="utf-8") as f:
-                    content = f.read()
-                    print("File content:")
-                    print("=" * 30)
-                    print(content)
-                    print("=" * 30)
+                content = raw_content.decode("utf-8")
+                print("File content:")
+                print("=" * 30)
+                print(content)
+                print("=" * 30)
             except UnicodeDecodeError:
                 print("⚠️  File contains special characters, showing raw content:")
-                with open("sci-fi-poem.txt", "rb") as f:
-                    raw_content = f.read()
-                    print(f"Raw bytes: {raw_content[:100]}...")
+                print(f"Raw bytes: {raw_content[:100]}...")
 
             # Get file info
             file_info = os.stat("sci-fi-poem.txt")
@@ -63,14 +59,11 @@ async def test_ai_file_creation():
         import traceback
         traceback.print_exc()
 
-async def test_memory_functionality():
+async def test_memory_functionality(ai_assistant):
     """Test the conversation memory functionality."""
     print("\n\nTesting AI Memory Functionality...")
     print("=" * 50)
 
-    file_manager = FileManager()
-    ai_assistant = AIAssistant(file_manager)
-
     # Multiple requests to test memory
     requests = [
         "Create a file called test1.txt with some content",
@@ -90,15 +83,22 @@ async def test_memory_functionality():
     # Show memory status
     print(f"\nMemory status: {ai_assistant.get_memory_summary()}")
 
-if __name__ == "__main__":
-    print("AI File Manager Test Suite")
-    print("=" * 60)
+async def main_tests():
+    """Run all tests against one assistant, so its client, caches and memory stay warm."""
+    file_manager = FileManager()
+    ai_assistant = AIAssistant(file_manager)
 
     # Run file creation test
-    asyncio.run(test_ai_file_creation())
+    await test_ai_file_creation(ai_assistant)
 
     # Run memory test
-    asyncio.run(test_memory_functionality())
+    await test_memory_functionality(ai_assistant)
+
+if __name__ == "__main__":
+    print("AI File Manager Test Suite")
+    print("=" * 60)
+
+    asyncio.run(main_tests())
 
     print("\n" + "=" * 60)
     print("Test suite completed!")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Test script for detecting JSON file actions in AI replies
+"""
+
+from ai_researcher_app import _extract_action
+
+
+def test_action_first():
+    """An object that opens with the action key is found."""
+    reply = 'Sure! {"action": "create_file", "path": "hello.txt", "content": "Hello World!"}'
+    assert _extract_action(reply) == {'action': 'create_file', 'path': 'hello.txt', 'content': 'Hello World!'}
+
+
+def test_action_not_first():
+    """The action key may come after other keys."""
+    reply = 'Here you go: {"path": "x.py", "action": "create_file", "content": "print(1)"} Done.'
+    assert _extract_action(reply) == {'path': 'x.py', 'action': 'create_file', 'content': 'print(1)'}
+
+
+def test_braces_inside_values():
+    """Braces in string values and nested objects don't hide the enclosing action."""
+    reply = '{"content": "function f() { return {}; }", "meta": {"k": 1}, "action": "create_file", "path": "f.js"}'
+    action = _extract_action(reply)
+    assert action is not None
+    assert action['action'] == 'create_file'
+    assert action['path'] == 'f.js'
+    assert action['content'] == 'function f() { return {}; }'
+
+
+def test_plain_reply():
+    """Replies without an action object yield nothing."""
+    assert _extract_action('Use {braces} freely, the "action": word alone is not JSON.') is None
+    assert _extract_action('{"path": "x.py"}') is None
+
+
+if __name__ == '__main__':
+    for test in (test_action_first, test_action_not_first, test_braces_inside_values, test_plain_reply):
+        test()
+        print(f"✓ {test.__name__}")
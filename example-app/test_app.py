@@ -3,64 +3,90 @@
 Test script for the AI researcher app
 """
 
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import time
 
-def test_chat_api():
-    """Test the chat API functionality"""
-    url = 'http://localhost:5001/api/chat'
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-    print("🧪 Testing AI Researcher App")
-    print("=" * 40)
+# Response bodies are parsed straight from bytes (json.loads accepts bytes too)
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+# Request bodies are sent as pre-encoded JSON bytes
+_json_dumps = orjson.dumps if HAS_ORJSON else (lambda obj: json.dumps(obj).encode('utf-8'))
+_JSON_HEADERS = {'Content-Type': 'application/json'}
 
-    # Test 1: Basic greeting
-    print("\n1. Testing basic chat...")
-    data1 = {'message': 'Hello! Can you help me with file operations?'}
-    try:
-        response1 = requests.post(url, json=data1, timeout=15)
-        print(f"   Status: {response1.status_code}")
-        result1 = response1.json()
-        print(f"   AI Response: {result1.get('response', 'No response')[:100]}...")
-    except Exception as e:
-        print(f"   Error: {e}")
-        return
+# The chat messages never change, so their request bodies are encoded once at import
+_BODY1 = _json_dumps({'message': 'Hello! Can you help me with file operations?'})
+_BODY2 = _json_dumps({'message': 'What did I just ask you about?'})
+_BODY3 = _json_dumps({'message': 'Create a test file called hello.txt with content "Hello World!"'})
 
-    time.sleep(2)
+# One session for all test requests. Failed connections (e.g. while the app starts) and
+# 502/503/504 replies are retried; POSTs only if they never reached the app.
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    pool_connections=1,
+    pool_maxsize=4
+))
 
-    # Test 2: Memory test
-    print("\n2. Testing memory retrieval...")
-    data2 = {'message': 'What did I just ask you about?'}
-    try:
-        response2 = requests.post(url, json=data2, timeout=15)
-        print(f"   Status: {response2.status_code}")
-        result2 = response2.json()
-        print(f"   AI Response: {result2.get('response', 'No response')[:100]}...")
-    except Exception as e:
-        print(f"   Error: {e}")
+CHAT_URL = 'http://localhost:5001/api/chat'
+MEMORY_URL = 'http://localhost:5001/api/chat/memory'
 
-    # Test 3: File operation
-    print("\n3. Testing file creation...")
-    data3 = {'message': 'Create a test file called hello.txt with content "Hello World!"'}
-    try:
-        response3 = requests.post(url, json=data3, timeout=15)
-        print(f"   Status: {response3.status_code}")
-        result3 = response3.json()
-        print(f"   AI Response: {result3.get('response', 'No response')[:100]}...")
-    except Exception as e:
-        print(f"   Error: {e}")
+def _run_test(heading, method, url, body=None, field='response', label='AI Response',
+              default='No response', limit=100, timeout=15):
+    """Run one test request and preview one field of its JSON reply.
 
-    # Test 4: Memory summary
-    print("\n4. Testing memory summary...")
+    Returns:
+        The block's output lines, and whether the request succeeded
+    """
+    lines = [f"\n{heading}"]
     try:
-        response4 = requests.get('http://localhost:5001/api/chat/memory', timeout=10)
-        print(f"   Status: {response4.status_code}")
-        result4 = response4.json()
-        print(f"   Memory Summary: {result4.get('memory', 'No summary')[:200]}...")
+        headers = _JSON_HEADERS if body is not None else None
+        response = SESSION.request(method, url, data=body, headers=headers, timeout=timeout)
+        lines.append(f"   Status: {response.status_code}")
+        result = _json_loads(response.content)
+        # A missing, null or empty field all fall back to the default text
+        value = result.get(field) or default
+        lines.append(f"   {label}: {value[:limit]}...")
+        return lines, True
     except Exception as e:
-        print(f"   Error: {e}")
+        lines.append(f"   Error: {e}")
+        return lines, False
+
+async def test_chat_api():
+    """Test the chat API functionality"""
+    print("🧪 Testing AI Researcher App\n" + "=" * 40)
+
+    # Each test block collects its lines and writes them out in one go
+
+    # Test 1: Basic greeting
+    lines, ok = await asyncio.to_thread(_run_test, "1. Testing basic chat...", 'POST', CHAT_URL, _BODY1)
+    print("\n".join(lines))
+    if not ok:
+        return
+
+    # Test 2: Memory test (the app records an exchange before it responds,
+    # so this can follow test 1 immediately)
+    lines, _ = await asyncio.to_thread(_run_test, "2. Testing memory retrieval...", 'POST', CHAT_URL, _BODY2)
+    print("\n".join(lines))
+
+    # Tests 3 and 4 don't depend on each other, so their requests overlap;
+    # their blocks are printed once both are done, in order
+    for lines, _ in await asyncio.gather(
+        asyncio.to_thread(_run_test, "3. Testing file creation...", 'POST', CHAT_URL, _BODY3),
+        asyncio.to_thread(_run_test, "4. Testing memory summary...", 'GET', MEMORY_URL,
+                          field='memory', label='Memory Summary', default='No summary',
+                          limit=200, timeout=10)
+    ):
+        print("\n".join(lines))
 
     print("\n✅ Testing complete!")
 
 if __name__ == '__main__':
-    test_chat_api()
+    asyncio.run(test_chat_api())
@@ -4,55 +4,81 @@ Test script for document creation from web research.
 This demonstrates how to use the new create-document API endpoint.
 """
 
+import sys
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Response bodies are parsed straight from bytes (json.loads accepts bytes too)
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+# Request bodies are sent as pre-encoded JSON bytes
+_json_dumps = orjson.dumps if HAS_ORJSON else (lambda obj: json.dumps(obj).encode('utf-8'))
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+# The result is logged as indented JSON bytes, written straight to the stdout buffer
+if HAS_ORJSON:
+    _json_dumps_indented = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+else:
+    _json_dumps_indented = lambda obj: json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
 # API endpoint
 API_URL = "http://localhost:5001/api/research/create-document"
 
+# Example URLs to scrape and screenshot
+TEST_DATA = {
+    "urls": [
+        "https://example.com",
+        "https://www.wikipedia.org"
+    ],
+    "title": "My Web Research Document"
+}
+# The request body is constant, so it is encoded once at import
+_TEST_BODY = _json_dumps(TEST_DATA)
+
+# Shared session with the same retry policy as test_app.py
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+))
+
 # Example: Create a document from multiple URLs
 def test_create_document():
     """Test creating a document from web URLs."""
     
-    # Example URLs to scrape and screenshot
-    test_data = {
-        "urls": [
-            "https://example.com",
-            "https://www.wikipedia.org"
-        ],
-        "title": "My Web Research Document"
-    }
-    
-    print("Sending request to create document...")
-    print(f"URLs: {test_data['urls']}")
-    print(f"Title: {test_data['title']}")
-    print("-" * 60)
+    print(
+        "Sending request to create document...\n"
+        f"URLs: {TEST_DATA['urls']}\n"
+        f"Title: {TEST_DATA['title']}\n"
+        + "-" * 60
+    )
     
     try:
-        response = requests.post(API_URL, json=test_data)
+        response = SESSION.post(API_URL, data=_TEST_BODY, headers=_JSON_HEADERS)
         
         if response.status_code == 200:
-            result = response.json()
-            print("\n✓ Document created successfully!")
-            print(f"  - Filename: {result['filename']}")
-            print(f"  - Path: {result['document_path']}")
-            print(f"  - URLs processed: {result['urls_processed']}")
-            print(f"  - Screenshots captured: {len(result['screenshots'])}")
-            print(f"  - Screenshot files: {', '.join(result['screenshots'])}")
-            print(f"\n{result['message']}")
+            result = _json_loads(response.content)
+            print("\n✓ Document created successfully!", flush=True)
+            sys.stdout.buffer.write(_json_dumps_indented(result) + b"\n")
+            sys.stdout.buffer.flush()
         else:
-            print(f"\n✗ Error: {response.status_code}")
-            print(response.json())
+            try:
+                detail = _json_loads(response.content)
+            except ValueError:
+                # Not JSON, e.g. an HTML 500 page or a proxy error
+                detail = response.text
+            print(f"\n✗ Error: {response.status_code}\n{detail}")
             
     except Exception as e:
         print(f"\n✗ Exception: {e}")
 
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("Web Research Document Creation Test")
-    print("=" * 60)
+    print("=" * 60 + "\nWeb Research Document Creation Test\n" + "=" * 60)
     test_create_document()
-    print("\n" + "=" * 60)
-    print("Test completed!")
-    print("=" * 60)
+    print("\n" + "=" * 60 + "\nTest completed!\n" + "=" * 60)